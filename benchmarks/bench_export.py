@@ -0,0 +1,64 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphics.mesh_export import export_mesh, export_mesh_streaming
+
+
+def synthetic_grid(face_target):
+    # Regular triangulated height field with roughly face_target triangles
+    side = max(2, int((face_target / 2) ** 0.5) + 1)
+    u, v = np.meshgrid(np.linspace(-1, 1, side), np.linspace(-1, 1, side))
+    vertices = np.column_stack([u.ravel(), v.ravel(), 0.1 * np.sin(4 * u.ravel()) * np.cos(4 * v.ravel())])
+
+    rows, cols = np.meshgrid(np.arange(side - 1), np.arange(side - 1), indexing='ij')
+    corner = (rows * side + cols).ravel()
+    faces = np.concatenate([
+        np.column_stack([corner, corner + 1, corner + side]),
+        np.column_stack([corner + 1, corner + side + 1, corner + side]),
+    ])
+    return vertices, faces
+
+
+def bench(label, write, filename, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        write(filename)
+        best = min(best, time.perf_counter() - start)
+    size_mb = os.path.getsize(filename) / (1024 * 1024)
+    print(f"{label:<16} {size_mb:9.1f} MB {best * 1000:9.1f} ms {size_mb / best:9.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export throughput benchmark")
+    parser.add_argument("--faces", type=int, default=2000000, help="approximate triangle count")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    vertices, faces = synthetic_grid(args.faces)
+    print(f"Mesh: {len(vertices):,} vertices, {len(faces):,} faces")
+    print(f"{'format':<16} {'size':>12} {'time':>12} {'throughput':>14}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext in ('.ply', '.stl', '.glb'):
+            path = os.path.join(tmp, f"bench{ext}")
+            bench(ext[1:].upper(), lambda f: export_mesh(f, vertices, faces), path, args.repeats)
+
+        # Streaming from memory-mapped buffers, as for meshes that don't fit in RAM
+        vertex_map = np.lib.format.open_memmap(os.path.join(tmp, "v.npy"), 'w+', np.float32, vertices.shape)
+        vertex_map[:] = vertices
+        face_map = np.lib.format.open_memmap(os.path.join(tmp, "f.npy"), 'w+', np.int32, faces.shape)
+        face_map[:] = faces
+        for ext in ('.ply', '.stl'):
+            path = os.path.join(tmp, f"stream{ext}")
+            bench(f"{ext[1:].upper()} (stream)", lambda f: export_mesh_streaming(f, vertex_map, face_map), path, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from math3d import batch
+
+
+def bench(label, function, count, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1000:9.1f} ms {count / best / 1e6:9.1f} M/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch quaternion toolkit benchmark")
+    parser.add_argument("--count", type=int, default=1000000, help="quaternions per batch")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.count
+    q = batch.random_quaternions(n, rng)
+    other = batch.random_quaternions(n, rng)
+    axes, angles = batch.quaternions_to_axis_angle(q)
+    matrices = batch.quaternions_to_matrices(q)
+    euler = batch.quaternions_to_euler(q)
+    rotation_vectors = batch.quaternions_to_rotation_vectors(q)
+    vectors = rng.random((n, 3))
+
+    print(f"{n:,} elements, best of {args.repeats}")
+    cases = [
+        ("normalize", lambda: batch.normalize_quaternions(q)),
+        ("multiply", lambda: batch.multiply_quaternions(q, other)),
+        ("rotate vectors", lambda: batch.rotate_vectors(q, vectors)),
+        ("quaternion -> axis-angle", lambda: batch.quaternions_to_axis_angle(q)),
+        ("axis-angle -> quaternion", lambda: batch.axis_angle_to_quaternions(axes, angles)),
+        ("quaternion -> matrix", lambda: batch.quaternions_to_matrices(q)),
+        ("matrix -> quaternion", lambda: batch.matrices_to_quaternions(matrices)),
+        ("quaternion -> euler xyz", lambda: batch.quaternions_to_euler(q)),
+        ("euler xyz -> quaternion", lambda: batch.euler_to_quaternions(euler)),
+        ("quaternion -> rotation vector", lambda: batch.quaternions_to_rotation_vectors(q)),
+        ("rotation vector -> quaternion", lambda: batch.rotation_vectors_to_quaternions(rotation_vectors)),
+        ("geodesic distance", lambda: batch.geodesic_distance(q, other)),
+        ("average (eigenvector)", lambda: batch.average_quaternions(q)),
+        ("average (robust)", lambda: batch.average_quaternions(q, robust=True)),
+    ]
+    for label, function in cases:
+        bench(label, function, n, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
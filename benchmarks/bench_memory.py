@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphics.memory_stats import AllocationTracer, footprint_table, format_bytes
+from tools.memory_report import profile_model
+from bench_export import synthetic_grid
+from bench_obj_load import write_obj
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory benchmark: footprint and peak allocations per mesh operation")
+    parser.add_argument("--faces", type=int, default=1000000, help="approximate triangle count")
+    parser.add_argument("--rotations", type=int, default=4, help="distinct rotations kept in the rotation cache")
+    parser.add_argument("--max-peak-ratio", type=float, metavar="RATIO",
+                        help="fail if an operation peaks above RATIO times the mesh's vertex and face bytes")
+    args = parser.parse_args()
+
+    vertices, faces = synthetic_grid(args.faces)
+    mesh_bytes = vertices.nbytes + faces.nbytes
+    print(f"Mesh: {len(vertices):,} vertices, {len(faces):,} faces, {format_bytes(mesh_bytes)} of vertices and faces")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.obj")
+        write_obj(path, vertices, faces)
+        tracer = AllocationTracer(enabled=True)
+        rows, host_bytes, gpu_bytes = profile_model(path, tracer, rotations=args.rotations)
+
+    print(footprint_table(rows))
+    print(f"Total: {format_bytes(host_bytes)} RAM, {format_bytes(gpu_bytes)} GPU")
+    print(f"{'operation':<16} {'peak':>12} {'retained':>12} {'peak/mesh':>10} {'time':>10}")
+    failed = []
+    for record in tracer.records.values():
+        ratio = record.peak_bytes / mesh_bytes
+        print(f"{record.label:<16} {format_bytes(record.peak_bytes):>12} {format_bytes(max(record.net_bytes, 0)):>12} "
+              f"{ratio:>9.2f}x {record.elapsed_ms:>7.0f} ms")
+        if args.max_peak_ratio is not None and ratio > args.max_peak_ratio:
+            failed.append(record.label)
+
+    if failed:
+        print(f"Peak above {args.max_peak_ratio:.2f}x the mesh size: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
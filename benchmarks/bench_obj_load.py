@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import trimesh
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphics.obj_reader import read_obj_batches
+from bench_export import synthetic_grid
+
+
+def write_obj(filename, vertices, faces):
+    with open(filename, 'w') as f:
+        np.savetxt(f, vertices, fmt='v %.6f %.6f %.6f')
+        np.savetxt(f, faces + 1, fmt='f %d %d %d')
+
+
+def bench_progressive(filename):
+    start = time.perf_counter()
+    first_batch = None
+    first_faces = None
+    batches = 0
+    for vertices, faces in read_obj_batches(filename):
+        now = time.perf_counter() - start
+        batches += 1
+        if first_batch is None:
+            first_batch = now
+        if first_faces is None and len(faces):
+            first_faces = now
+    return first_batch, first_faces, time.perf_counter() - start, batches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OBJ load benchmark: time to first batch vs full load")
+    parser.add_argument("--faces", type=int, default=2000000, help="approximate triangle count")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    vertices, faces = synthetic_grid(args.faces)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.obj")
+        write_obj(path, vertices, faces)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"Mesh: {len(vertices):,} vertices, {len(faces):,} faces, {size_mb:.1f} MB")
+
+        best = float('inf')
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            trimesh.load(path, force='mesh')
+            best = min(best, time.perf_counter() - start)
+        print(f"{'trimesh.load':<24} full {best * 1000:9.1f} ms")
+
+        results = [bench_progressive(path) for _ in range(args.repeats)]
+        first_batch, first_faces, total, batches = min(results, key=lambda r: r[2])
+        print(
+            f"{'progressive reader':<24} full {total * 1000:9.1f} ms, first batch {first_batch * 1000:.1f} ms, "
+            f"first faces {first_faces * 1000:.1f} ms, {batches} batches"
+        )
+
+
+if __name__ == "__main__":
+    main()
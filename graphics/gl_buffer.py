@@ -0,0 +1,198 @@
+import ctypes
+import numpy as np
+from graphics.memory_stats import unique_nbytes
+
+
+class VertexBuffer:
+    # Interleaved (x, y, z, nx, ny, nz) float32 geometry in one VBO. Subclasses provide
+    # draw_length(), draw_buffer() and draw_bound(); GL calls need the owning context current.
+    # Geometry with an index_array() can instead be uploaded as shared vertices plus an element
+    # buffer (shader path only, which derives flat normals per fragment).
+
+    STRIDE = 6 * 4
+
+    # Growable geometry (progressive loading) over-allocates so appends are sub-data uploads
+    growable = False
+
+    def __init__(self):
+        self._vbo = None
+        self._vao = None
+        self._vertex_count = 0
+        self._capacity = 0
+        self._staged = None
+        self._staged_indexed = False
+        self._ebo = None
+        self._index_count = 0
+        self._indexed = False
+
+    def draw_length(self):
+        raise NotImplementedError
+
+    def draw_buffer(self, first_row=0):
+        raise NotImplementedError
+
+    def draw_bound(self):
+        raise NotImplementedError
+
+    def index_array(self):
+        # (N, 3) triangle indices if the geometry can be drawn indexed, otherwise None
+        return None
+
+    def indexed_buffer(self):
+        # Shared vertex rows for indexed drawing
+        raise NotImplementedError
+
+    def uses_indices(self):
+        # Whether the uploaded buffers are drawn with glDrawElements
+        return self._indexed
+
+    def upload_nbytes(self, indexed=False):
+        # GPU memory an upload in the given layout takes
+        indices = self.index_array() if indexed else None
+        if indices is not None:
+            return len(self.indexed_buffer()) * self.STRIDE + indices.size * 4
+        return self.draw_length() * self.STRIDE
+
+    def stage(self):
+        # Build the vertex rows ahead of time (e.g. on a prefetch thread) so the upload on the
+        # GL thread is a plain copy. Indexable geometry is staged for the shader path's layout.
+        self._staged_indexed = self.index_array() is not None
+        self._staged = self.indexed_buffer() if self._staged_indexed else self.draw_buffer()
+
+    def host_arrays(self):
+        # Host memory per footprint category (graphics.memory_stats.CATEGORIES); subclasses add their geometry
+        return {'staged': [self._staged]}
+
+    def footprint(self):
+        footprint = {category: unique_nbytes(arrays) for category, arrays in self.host_arrays().items()}
+        footprint['gpu'] = self.gpu_nbytes()
+        return footprint
+
+    def nbytes(self):
+        return unique_nbytes([array for arrays in self.host_arrays().values() for array in arrays])
+
+    def gpu_nbytes(self):
+        return self._capacity * self.STRIDE + self._index_count * 4 if self._vbo is not None else 0
+
+    def upload(self, indexed=False):
+        from OpenGL.GL import (glGenBuffers, glBindBuffer, glBufferData, glBufferSubData,
+                               GL_ARRAY_BUFFER, GL_STATIC_DRAW, GL_DYNAMIC_DRAW)
+
+        indices = self.index_array() if indexed else None
+        if indices is not None:
+            self._upload_indexed(indices)
+            return
+        if self._indexed:
+            # Switching layouts: the shared vertex rows can't be extended into triangles
+            self._indexed = False
+            self._index_count = 0
+            self._vertex_count = 0
+            self._capacity = 0
+
+        if self._vbo is None:
+            self._vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        length = self.draw_length()
+        if length == self._vertex_count and (self.growable or length == self._capacity):
+            return
+
+        # Only rows past _vertex_count are sent, unless the storage has to be reallocated.
+        # Static geometry is sized exactly, so it is uploaded once (or once more when a
+        # progressive load finishes and the spare capacity is dropped).
+        if length > self._capacity or (not self.growable and length != self._capacity):
+            self._capacity = max(length, 2 * self._capacity) if self.growable else length
+            usage = GL_DYNAMIC_DRAW if self.growable else GL_STATIC_DRAW
+            glBufferData(GL_ARRAY_BUFFER, self._capacity * self.STRIDE, None, usage)
+            self._vertex_count = 0
+        if length > self._vertex_count:
+            if self._vertex_count == 0 and self._staged is not None and not self._staged_indexed and len(self._staged) == length:
+                rows = self._staged
+            else:
+                rows = self.draw_buffer(self._vertex_count)
+            glBufferSubData(GL_ARRAY_BUFFER, self._vertex_count * self.STRIDE, rows.nbytes, rows)
+        self._vertex_count = length
+        self._staged = None
+
+    def _upload_indexed(self, indices):
+        from OpenGL.GL import (glGenBuffers, glBindBuffer, glBufferData, GL_ARRAY_BUFFER,
+                               GL_COPY_WRITE_BUFFER, GL_STATIC_DRAW)
+
+        if self._vbo is None:
+            self._vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        if self._indexed and self._index_count == indices.size:
+            return
+
+        rows = self._staged if self._staged is not None and self._staged_indexed else self.indexed_buffer()
+        glBufferData(GL_ARRAY_BUFFER, rows.nbytes, rows, GL_STATIC_DRAW)
+        self._capacity = self._vertex_count = len(rows)
+
+        # Filled through the copy target: the element array binding belongs to whatever VAO is
+        # bound, and bind_vertex_array() attaches the buffer to this one
+        elements = np.ascontiguousarray(indices, dtype=np.uint32)
+        if self._ebo is None:
+            self._ebo = glGenBuffers(1)
+        glBindBuffer(GL_COPY_WRITE_BUFFER, self._ebo)
+        glBufferData(GL_COPY_WRITE_BUFFER, elements.nbytes, elements, GL_STATIC_DRAW)
+        glBindBuffer(GL_COPY_WRITE_BUFFER, 0)
+        self._index_count = elements.size
+        self._indexed = True
+        self._staged = None
+
+    def bind(self):
+        from OpenGL.GL import (glEnableClientState, glVertexPointer, glNormalPointer,
+                               GL_VERTEX_ARRAY, GL_NORMAL_ARRAY, GL_FLOAT)
+
+        self.upload()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glVertexPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(0))
+        glNormalPointer(GL_FLOAT, self.STRIDE, ctypes.c_void_p(3 * 4))
+
+    def bind_vertex_array(self):
+        from OpenGL.GL import (glGenVertexArrays, glBindVertexArray, glBindBuffer, glEnableVertexAttribArray,
+                               glVertexAttribPointer, GL_ARRAY_BUFFER, GL_ELEMENT_ARRAY_BUFFER, GL_FLOAT, GL_FALSE)
+
+        # Shader path: attribute 0 is position, 1 is normal, recorded once in a VAO
+        if self._vao is None:
+            self._vao = glGenVertexArrays(1)
+            glBindVertexArray(self._vao)
+            self.upload(indexed=True)
+            glEnableVertexAttribArray(0)
+            glEnableVertexAttribArray(1)
+            glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, self.STRIDE, ctypes.c_void_p(0))
+            glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, self.STRIDE, ctypes.c_void_p(3 * 4))
+        else:
+            # The array buffer binding is not VAO state, so this only picks up appended rows
+            glBindVertexArray(self._vao)
+            self.upload(indexed=True)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._ebo if self._indexed else 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def unbind(self):
+        from OpenGL.GL import glBindBuffer, glDisableClientState, GL_ARRAY_BUFFER, GL_VERTEX_ARRAY, GL_NORMAL_ARRAY
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        self.bind()
+        self.draw_bound()
+        self.unbind()
+
+    def release_gl(self):
+        # Must be called with the owning GL context current
+        from OpenGL.GL import glDeleteBuffers, glDeleteVertexArrays
+        if self._vao is not None:
+            glDeleteVertexArrays(1, [self._vao])
+            self._vao = None
+        if self._vbo is not None:
+            glDeleteBuffers(1, [self._vbo])
+            self._vbo = None
+        if self._ebo is not None:
+            glDeleteBuffers(1, [self._ebo])
+            self._ebo = None
+        self._vertex_count = 0
+        self._capacity = 0
+        self._index_count = 0
+        self._indexed = False
@@ -0,0 +1,108 @@
+import gc
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+import numpy as np
+
+# Footprint categories, in report order; everything but "gpu" is host memory
+CATEGORIES = ('vertices', 'faces', 'normals', 'trimesh', 'point_sample', 'staged', 'gpu')
+
+
+def owner(array):
+    # The array that owns the memory behind a view
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def unique_nbytes(arrays):
+    # Views of one buffer (rotated copies share faces, loaded meshes share trimesh's arrays) count once
+    owners = {}
+    for array in arrays:
+        if array is not None:
+            base = owner(np.asarray(array))
+            owners[id(base)] = base
+    return sum(base.nbytes for base in owners.values())
+
+
+def format_bytes(count):
+    if count >= 1024 * 1024:
+        return f"{count / (1024 * 1024):.1f} MB"
+    if count >= 1024:
+        return f"{count / 1024:.1f} KB"
+    return f"{count} B"
+
+
+def footprint_table(rows):
+    # rows: (label, {category: bytes}); categories no row uses are left out
+    columns = [c for c in CATEGORIES if any(footprint.get(c) for _, footprint in rows)]
+    width = max([len(label) for label, _ in rows] + [5])
+    lines = [f"{'':<{width}} " + " ".join(f"{c:>12}" for c in columns + ['host'])]
+    for label, footprint in rows:
+        host = sum(b for c, b in footprint.items() if c != 'gpu')
+        cells = [format_bytes(footprint[c]) if footprint.get(c) else '-' for c in columns]
+        lines.append(f"{label:<{width}} " + " ".join(f"{cell:>12}" for cell in cells + [format_bytes(host)]))
+    return "\n".join(lines)
+
+
+class AllocationRecord:
+    def __init__(self, label, peak_bytes, net_bytes, elapsed_ms):
+        self.label = label
+        # Peak above the memory in use when the traced block started, and what it kept allocated
+        self.peak_bytes = peak_bytes
+        self.net_bytes = net_bytes
+        self.elapsed_ms = elapsed_ms
+
+    def __str__(self):
+        return (f"{self.label}: peak {format_bytes(self.peak_bytes)}, "
+                f"retained {format_bytes(max(self.net_bytes, 0))}, {self.elapsed_ms:.0f} ms")
+
+
+class AllocationTracer:
+    # Peak Python/numpy allocations of traced blocks via tracemalloc. Tracing slows allocation
+    # down considerably, so it is off unless enabled (or QUATERNION_VISUALIZER_TRACE_MEMORY=1).
+    # tracemalloc sees every thread, so background loads running meanwhile are counted too.
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get("QUATERNION_VISUALIZER_TRACE_MEMORY", "") not in ("", "0")
+        self.enabled = enabled
+        # Latest record per label
+        self.records = {}
+        self._open = []
+
+    @contextmanager
+    def trace(self, label):
+        if not self.enabled:
+            yield
+            return
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        current, peak = tracemalloc.get_traced_memory()
+        # reset_peak() is global, so enclosing blocks keep the peak seen so far
+        for entry in self._open:
+            entry[1] = max(entry[1], peak)
+        tracemalloc.reset_peak()
+        entry = [current, current]
+        self._open.append(entry)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._open.remove(entry)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            peak = max(tracemalloc.get_traced_memory()[1], entry[1])
+            # trimesh leaves reference cycles behind; without a collection they would look retained
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0]
+            for outer in self._open:
+                outer[1] = max(outer[1], peak)
+            if started and not self._open:
+                tracemalloc.stop()
+            self.records[label] = AllocationRecord(label, peak - entry[0], current - entry[0], elapsed_ms)
+
+    def report(self):
+        return "\n".join(str(record) for record in self.records.values())
@@ -0,0 +1,219 @@
+import json
+import os
+import struct
+import numpy as np
+
+# Binary exporters writing straight from contiguous NumPy buffers. Every format
+# is assembled as a few large tobytes() blocks; nothing is formatted per vertex.
+
+EXPORT_FORMATS = {
+    '.ply': "Binary PLY",
+    '.stl': "Binary STL",
+    '.glb': "glTF Binary (GLB)",
+}
+
+STL_TRIANGLE_DTYPE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attribute', '<u2'),
+])
+
+PLY_FACE_DTYPE = np.dtype([
+    ('count', 'u1'),
+    ('indices', '<i4', (3,)),
+])
+
+
+def triangle_normals(triangles):
+    triangles = np.asarray(triangles, dtype=np.float64)
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return normals / np.maximum(lengths, 1e-12)
+
+
+def ply_header(vertex_count, face_count):
+    return (
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        "comment exported by Quaternion Visualizer\n"
+        f"element vertex {vertex_count}\n"
+        "property float x\n"
+        "property float y\n"
+        "property float z\n"
+        f"element face {face_count}\n"
+        "property list uchar int vertex_indices\n"
+        "end_header\n"
+    ).encode('ascii')
+
+
+def ply_face_block(faces):
+    block = np.empty(len(faces), dtype=PLY_FACE_DTYPE)
+    block['count'] = 3
+    block['indices'] = faces
+    return block.tobytes()
+
+
+def stl_triangle_block(vertices, faces):
+    # Only the referenced rows are gathered, so memory-mapped vertices stay on disk
+    triangles = vertices[faces]
+    block = np.zeros(len(faces), dtype=STL_TRIANGLE_DTYPE)
+    block['normal'] = triangle_normals(triangles)
+    block['vertices'] = triangles
+    return block.tobytes()
+
+
+def write_ply(filename, vertices, faces):
+    vertices = np.ascontiguousarray(vertices, dtype='<f4')
+    faces = np.asarray(faces)
+    with open(filename, 'wb') as f:
+        f.write(ply_header(len(vertices), len(faces)))
+        f.write(vertices.tobytes())
+        f.write(ply_face_block(faces))
+
+
+def write_stl(filename, vertices, faces):
+    vertices = np.asarray(vertices)
+    faces = np.asarray(faces)
+    with open(filename, 'wb') as f:
+        f.write(b"Quaternion Visualizer binary STL".ljust(80, b' '))
+        f.write(struct.pack('<I', len(faces)))
+        f.write(stl_triangle_block(vertices, faces))
+
+
+def write_glb(filename, vertices, faces):
+    positions = np.ascontiguousarray(vertices, dtype='<f4')
+    indices = np.ascontiguousarray(faces, dtype='<u4').reshape(-1)
+
+    # Both buffer views are 4-byte aligned since float32/uint32 sizes are multiples of 4
+    positions_bytes = positions.nbytes
+    indices_bytes = indices.nbytes
+    gltf = {
+        "asset": {"version": "2.0", "generator": "Quaternion Visualizer"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "indices": 1, "mode": 4}]}],
+        "buffers": [{"byteLength": positions_bytes + indices_bytes}],
+        "bufferViews": [
+            {"buffer": 0, "byteOffset": 0, "byteLength": positions_bytes, "target": 34962},
+            {"buffer": 0, "byteOffset": positions_bytes, "byteLength": indices_bytes, "target": 34963},
+        ],
+        "accessors": [
+            {
+                "bufferView": 0, "componentType": 5126, "count": len(positions), "type": "VEC3",
+                "min": positions.min(axis=0).tolist() if len(positions) else [0, 0, 0],
+                "max": positions.max(axis=0).tolist() if len(positions) else [0, 0, 0],
+            },
+            {"bufferView": 1, "componentType": 5125, "count": len(indices), "type": "SCALAR"},
+        ],
+    }
+
+    json_chunk = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+    json_chunk += b' ' * (-len(json_chunk) % 4)
+    bin_length = positions_bytes + indices_bytes
+    total_length = 12 + 8 + len(json_chunk) + 8 + bin_length
+
+    with open(filename, 'wb') as f:
+        f.write(struct.pack('<4sII', b'glTF', 2, total_length))
+        f.write(struct.pack('<I4s', len(json_chunk), b'JSON'))
+        f.write(json_chunk)
+        f.write(struct.pack('<I4s', bin_length, b'BIN\x00'))
+        f.write(positions.tobytes())
+        f.write(indices.tobytes())
+
+
+WRITERS = {
+    '.ply': write_ply,
+    '.stl': write_stl,
+    '.glb': write_glb,
+}
+
+
+def export_mesh(filename, vertices, faces):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Unsupported export format '{extension}', expected one of {', '.join(WRITERS)}")
+    WRITERS[extension](filename, vertices, faces)
+
+
+class StreamingPlyWriter:
+    # Out-of-core PLY: counts are fixed up front, then vertex and face chunks are appended in order
+
+    def __init__(self, filename, vertex_count, face_count):
+        self.vertex_count = vertex_count
+        self.face_count = face_count
+        self._vertices_written = 0
+        self._faces_written = 0
+        self._file = open(filename, 'wb')
+        self._file.write(ply_header(vertex_count, face_count))
+
+    def write_vertices(self, vertices):
+        if self._faces_written:
+            raise RuntimeError("All vertices must be written before faces")
+        vertices = np.ascontiguousarray(vertices, dtype='<f4')
+        self._file.write(vertices.tobytes())
+        self._vertices_written += len(vertices)
+
+    def write_faces(self, faces):
+        if self._vertices_written != self.vertex_count:
+            raise RuntimeError(f"Expected {self.vertex_count} vertices before faces, got {self._vertices_written}")
+        faces = np.asarray(faces)
+        self._file.write(ply_face_block(faces))
+        self._faces_written += len(faces)
+
+    def close(self):
+        self._file.close()
+        if self._faces_written != self.face_count:
+            raise RuntimeError(f"Expected {self.face_count} faces, got {self._faces_written}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+
+class StreamingStlWriter:
+    # Out-of-core STL: triangles are appended in chunks and the count is patched on close
+
+    def __init__(self, filename):
+        self.triangle_count = 0
+        self._file = open(filename, 'wb')
+        self._file.write(b"Quaternion Visualizer binary STL".ljust(80, b' '))
+        self._file.write(struct.pack('<I', 0))
+
+    def write_faces(self, vertices, faces):
+        faces = np.asarray(faces)
+        self._file.write(stl_triangle_block(vertices, faces))
+        self.triangle_count += len(faces)
+
+    def close(self):
+        self._file.seek(80)
+        self._file.write(struct.pack('<I', self.triangle_count))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def export_mesh_streaming(filename, vertices, faces, chunk_size=1 << 20):
+    # vertices/faces may be np.memmap arrays; only chunk_size rows are resident at a time
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.ply':
+        with StreamingPlyWriter(filename, len(vertices), len(faces)) as writer:
+            for start in range(0, len(vertices), chunk_size):
+                writer.write_vertices(vertices[start:start + chunk_size])
+            for start in range(0, len(faces), chunk_size):
+                writer.write_faces(faces[start:start + chunk_size])
+    elif extension == '.stl':
+        with StreamingStlWriter(filename) as writer:
+            for start in range(0, len(faces), chunk_size):
+                writer.write_faces(vertices, faces[start:start + chunk_size])
+    else:
+        raise ValueError(f"Streaming export supports .ply and .stl, not '{extension}'")
@@ -1,37 +1,208 @@
+import ctypes
 import trimesh
+import hashlib
+import os
+import tempfile
+import numpy as np
+from graphics.mesh_export import export_mesh, export_mesh_streaming, triangle_normals
+from graphics.mesh_optimize import optimize_mesh, DEFAULT_CACHE_SIZE
+from graphics.gl_buffer import VertexBuffer
+from graphics.point_cloud import PointCloud, stratified_sample, adjacent_faces, DEFAULT_POINT_BUDGET
 
-class MeshObject:
-    def __init__(self, filename):
-        self.mesh = trimesh.load(filename, force='mesh')
-        self.vertices = self.mesh.vertices
-        self.faces = self.mesh.faces
-
-    def draw(self):
-        from OpenGL.GL import glBegin, glEnd, glVertex3f, glNormal3f, GL_TRIANGLES
-        import numpy as np
-        
-        glBegin(GL_TRIANGLES)
-        for face in self.faces:
-            # Calculate face normal for better lighting
-            v0, v1, v2 = [self.vertices[face[i]] for i in range(3)]
-            
-            # Calculate normal using cross product
-            edge1 = np.array(v1) - np.array(v0)
-            edge2 = np.array(v2) - np.array(v0)
-            normal = np.cross(edge1, edge2)
-            normal = normal / (np.linalg.norm(normal) + 1e-8)  # Normalize
-            
-            # Set normal for this face
-            glNormal3f(normal[0], normal[1], normal[2])
-            
-            # Draw vertices
-            for idx in face:
-                v = self.vertices[idx]
-                glVertex3f(v[0], v[1], v[2])
-        glEnd()
+MESH_CACHE_VERSION = 3
+
+
+def optimized_cache_path(filename, cache_size):
+    stat = os.stat(filename)
+    key = f"{os.path.abspath(filename)}:{stat.st_mtime_ns}:{stat.st_size}:{cache_size}:{MESH_CACHE_VERSION}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    cache_dir = os.path.join(tempfile.gettempdir(), "quaternion-visualizer")
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, f"{digest}.mesh.npz")
+
+
+def append_rows(store, length, rows):
+    # Geometric growth keeps a long series of appends linear overall
+    needed = length + len(rows)
+    if needed > len(store):
+        grown = np.empty((max(needed, 2 * len(store)), store.shape[1]), dtype=store.dtype)
+        grown[:length] = store[:length]
+        store = grown
+    store[length:needed] = rows
+    return store, needed
+
+
+class MeshObject(VertexBuffer):
+    # Set while a progressive load is still appending batches
+    loading = False
+
+    def __init__(self, filename, optimize=False, cache_size=DEFAULT_CACHE_SIZE):
+        super().__init__()
+        self.optimization_stats = None
+        self._point_sample = None
+        self._bounds = None
+        if optimize:
+            self._load_optimized(filename, cache_size)
+            return
+
+        self._mesh = trimesh.load(filename, force='mesh')
+        self.vertices = self._mesh.vertices
+        self.faces = self._mesh.faces
+
+    def _load_optimized(self, filename, cache_size):
+        # Welding and reordering are slow in Python, so the result is cached on disk per file version
+        cache_path = optimized_cache_path(filename, cache_size)
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as cached:
+                vertices, faces = cached['vertices'], cached['faces']
+                stats = {key[len('stat_'):]: cached[key].item() for key in cached.files if key.startswith('stat_')}
+        else:
+            loaded = trimesh.load(filename, force='mesh')
+            vertices, faces, stats = optimize_mesh(loaded.vertices, loaded.faces, cache_size=cache_size)
+            np.savez(cache_path, vertices=vertices, faces=faces, **{f"stat_{k}": v for k, v in stats.items()})
+
+        self._mesh = None
+        self.vertices = vertices
+        self.faces = faces
+        self.optimization_stats = stats
+
+    @classmethod
+    def progressive(cls):
+        # Empty mesh that grows batch by batch while its file is still being read
+        mesh = cls.__new__(cls)
+        VertexBuffer.__init__(mesh)
+        mesh._mesh = None
+        mesh._point_sample = None
+        mesh._bounds = None
+        mesh.optimization_stats = None
+        mesh.growable = True
+        mesh.loading = True
+        mesh._vertex_store = np.empty((0, 3))
+        mesh._face_store = np.empty((0, 3), dtype=np.int64)
+        mesh.vertices = mesh._vertex_store
+        mesh.faces = mesh._face_store
+        return mesh
+
+    def append(self, vertices, faces):
+        self._vertex_store, vertex_count = append_rows(self._vertex_store, len(self.vertices), vertices)
+        self._face_store, face_count = append_rows(self._face_store, len(self.faces), faces)
+        self.vertices = self._vertex_store[:vertex_count]
+        self.faces = self._face_store[:face_count]
+        self._mesh = None
+        self._point_sample = None
+
+        if len(vertices):
+            lower, upper = np.min(vertices, axis=0), np.max(vertices, axis=0)
+            if self._bounds is not None:
+                lower, upper = np.minimum(lower, self._bounds[0]), np.maximum(upper, self._bounds[1])
+            self._bounds = (lower, upper)
+
+    def finish_loading(self):
+        # Drop the spare capacity now that the size is final; the GPU buffer is resized on next upload
+        self.vertices = self.vertices.copy()
+        self.faces = self.faces.copy()
+        self._vertex_store = None
+        self._face_store = None
+        self.growable = False
+        self.loading = False
+
+    def bounds(self):
+        # (min corner, max corner), or None for an empty mesh
+        if self._bounds is None and len(self.vertices):
+            vertices = np.asarray(self.vertices)
+            self._bounds = (vertices.min(axis=0), vertices.max(axis=0))
+        return self._bounds
+
+    def host_arrays(self):
+        # Rotated copies share faces and the point sample with the original, so totals over
+        # several meshes should go through unique_nbytes rather than add up footprints
+        arrays = super().host_arrays()
+        arrays['vertices'] = [self.vertices]
+        arrays['faces'] = [self.faces]
+        arrays['normals'] = []
+        arrays['trimesh'] = []
+        if self._mesh is not None:
+            # Derived data trimesh computed on demand (normals, adjacency, ...)
+            for name, value in self._mesh._cache.cache.items():
+                if isinstance(value, np.ndarray):
+                    arrays['normals' if 'normal' in name else 'trimesh'].append(value)
+        arrays['point_sample'] = list(self._point_sample[1:]) if self._point_sample is not None else []
+        return arrays
+
+    @property
+    def mesh(self):
+        # Rotated copies only build a trimesh object when something actually asks for it
+        if self._mesh is None:
+            self._mesh = trimesh.Trimesh(vertices=self.vertices, faces=self.faces, process=False)
+        return self._mesh
+
+    def draw_length(self):
+        return 3 * len(self.faces)
+
+    def draw_buffer(self, first_row=0):
+        # De-indexed triangles with flat face normals, interleaved as (x, y, z, nx, ny, nz) float32
+        faces = self.faces[first_row // 3:]
+        triangles = np.asarray(self.vertices)[faces]
+        normals = triangle_normals(triangles)
+        buffer = np.empty((len(faces), 3, 6), dtype=np.float32)
+        buffer[:, :, :3] = triangles
+        buffer[:, :, 3:] = normals[:, None, :]
+        return buffer.reshape(-1, 6)
+
+    def index_array(self):
+        # Optimized meshes are drawn indexed so the Tipsify face order actually reuses the
+        # post-transform vertex cache; the others keep de-indexed flat-normal triangles
+        return self.faces if self.optimization_stats is not None else None
+
+    def indexed_buffer(self):
+        # Normals are left zero: the shader derives flat face normals from screen-space derivatives
+        buffer = np.zeros((len(self.vertices), 6), dtype=np.float32)
+        buffer[:, :3] = self.vertices
+        return buffer
+
+    def upload_nbytes(self, indexed=False):
+        if indexed and self.index_array() is not None:
+            # Without building the vertex rows
+            return len(self.vertices) * self.STRIDE + self.faces.size * 4
+        return super().upload_nbytes(indexed)
+
+    def draw_bound(self):
+        from OpenGL.GL import glDrawArrays, glDrawElements, GL_TRIANGLES, GL_UNSIGNED_INT
+        if self._indexed:
+            glDrawElements(GL_TRIANGLES, self._index_count, GL_UNSIGNED_INT, ctypes.c_void_p(0))
+        else:
+            glDrawArrays(GL_TRIANGLES, 0, self._vertex_count)
+
+    def point_sample(self, budget=DEFAULT_POINT_BUDGET):
+        # (budget, vertex indices, adjacent face per index), computed once per budget
+        if self._point_sample is None or self._point_sample[0] != budget:
+            indices = stratified_sample(self.vertices, budget)
+            self._point_sample = (budget, indices, adjacent_faces(self.faces, indices, len(self.vertices)))
+        return self._point_sample
+
+    def point_cloud(self, budget=DEFAULT_POINT_BUDGET, sample=None):
+        # The stratified sample depends on vertex positions, so a rotated copy has to be given
+        # its original's sample; only then is its cloud a rotation of the original cloud
+        _, indices, face_index = sample if sample is not None else self.point_sample(budget)
+
+        normals = np.zeros((len(indices), 3))
+        has_face = face_index >= 0
+        normals[has_face] = triangle_normals(self.vertices[self.faces[face_index[has_face]]])
+        return PointCloud(self.vertices[indices], normals)
 
     def create_copy_with_new_vertices(self, new_vertices):
         copy = MeshObject.__new__(MeshObject)
+        VertexBuffer.__init__(copy)
+        copy._mesh = None
+        copy._point_sample = None
+        copy._bounds = None
+        copy.optimization_stats = self.optimization_stats
         copy.vertices = new_vertices
         copy.faces = self.faces
         return copy
+
+    def export(self, filename, streaming=False):
+        if streaming:
+            export_mesh_streaming(filename, self.vertices, self.faces)
+        else:
+            export_mesh(filename, self.vertices, self.faces)
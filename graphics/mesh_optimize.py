@@ -0,0 +1,209 @@
+from collections import deque
+import numpy as np
+
+# Load-time mesh preprocessing: vertex welding, degenerate face removal and
+# triangle reordering for the GPU post-transform vertex cache.
+
+DEFAULT_CACHE_SIZE = 16
+
+
+# The cell itself and the 13 neighbours that sort after it; each adjacent pair of cells is visited once
+NEIGHBOUR_OFFSETS = [
+    (dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1) if (dx, dy, dz) >= (0, 0, 0)
+]
+
+
+def cell_keys(cells):
+    # One opaque key per integer cell row, so rows can be sorted and searched as scalars
+    cells = np.ascontiguousarray(cells, dtype=np.int64)
+    return cells.view(np.dtype((np.void, cells.dtype.itemsize * cells.shape[1]))).ravel()
+
+
+def close_pairs(vertices, tolerance):
+    # All index pairs (i, j), i != j, with |v_i - v_j| <= tolerance. Vertices are hashed into cells
+    # of size `tolerance`, so such a pair always lies in one cell or in two adjacent ones.
+    cells = np.floor(vertices / tolerance).astype(np.int64)
+    order = np.argsort(cell_keys(cells), kind='stable')
+    sorted_cells = cells[order]
+    sorted_keys = cell_keys(sorted_cells)
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    counts = np.diff(np.r_[starts, len(order)])
+    unique_keys = sorted_keys[starts]
+    cell_of = np.repeat(np.arange(len(starts)), counts)
+
+    first, second = [], []
+    for offset in NEIGHBOUR_OFFSETS:
+        # Every vertex against every vertex of the neighbouring cell, if that cell is occupied
+        neighbour_keys = cell_keys(sorted_cells[starts] + offset)
+        found = np.minimum(np.searchsorted(unique_keys, neighbour_keys), len(starts) - 1)
+        found = np.where(unique_keys[found] == neighbour_keys, found, -1)[cell_of]
+        has_neighbour = found >= 0
+        if not has_neighbour.any():
+            continue
+        rows = np.flatnonzero(has_neighbour)
+        sizes = counts[found[rows]]
+        left = np.repeat(rows, sizes)
+        right = np.repeat(starts[found[rows]] - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+        if offset == (0, 0, 0):
+            keep = right > left
+            left, right = left[keep], right[keep]
+        close = np.einsum('ij,ij->i', *(2 * [vertices[order[left]] - vertices[order[right]]])) <= tolerance ** 2
+        first.append(order[left[close]])
+        second.append(order[right[close]])
+    if not first:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(first), np.concatenate(second)
+
+
+def weld_vertices(vertices, faces, tolerance):
+    # Merges every pair of vertices at most `tolerance` apart, and transitively chains of such
+    # pairs; each group keeps the position of its lowest-index vertex
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if len(vertices) == 0:
+        return vertices, np.asarray(faces)
+    first, second = close_pairs(vertices, tolerance)
+
+    # Connected components by propagating the smallest index across pairs, with pointer jumping
+    labels = np.arange(len(vertices))
+    while len(first):
+        lowest = np.minimum(labels[first], labels[second])
+        if np.array_equal(lowest, labels[first]) and np.array_equal(lowest, labels[second]):
+            break
+        np.minimum.at(labels, first, lowest)
+        np.minimum.at(labels, second, lowest)
+        labels = labels[labels]
+
+    kept = np.unique(labels)
+    return vertices[kept], np.searchsorted(kept, labels)[faces]
+
+
+def remove_degenerate_faces(vertices, faces, area_epsilon=1e-12):
+    faces = np.asarray(faces)
+    repeated = (faces[:, 0] == faces[:, 1]) | (faces[:, 1] == faces[:, 2]) | (faces[:, 0] == faces[:, 2])
+    triangles = vertices[faces]
+    doubled_area = np.linalg.norm(np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]), axis=1)
+    return faces[~repeated & (doubled_area > area_epsilon)]
+
+
+def reorder_vertices_by_first_use(vertices, faces):
+    # Renumber vertices in the order the (reordered) index buffer first touches them
+    flat = faces.reshape(-1)
+    used, first_seen = np.unique(flat, return_index=True)
+    order = used[np.argsort(first_seen)]
+    remap = np.empty(len(vertices), dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    return vertices[order], remap[faces]
+
+
+def tipsify(faces, vertex_count, cache_size=DEFAULT_CACHE_SIZE):
+    # Sander, Nehab & Barczak, "Fast Triangle Reordering for Vertex Locality and Reduced Overdraw" (2007)
+    faces = np.asarray(faces)
+    if len(faces) == 0:
+        return faces
+
+    flat = faces.reshape(-1)
+    valence = np.bincount(flat, minlength=vertex_count)
+    offsets = np.concatenate([[0], np.cumsum(valence)]).tolist()
+    adjacency = (np.argsort(flat, kind='stable') // 3).tolist()
+    live = valence.tolist()
+    face_list = faces.tolist()
+
+    timestamps = [0] * vertex_count
+    emitted = bytearray(len(faces))
+    output = []
+    dead_end = []
+    time = cache_size + 1
+    cursor = 0
+    fanning = 0
+
+    while fanning >= 0:
+        candidates = []
+        for t in adjacency[offsets[fanning]:offsets[fanning + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = 1
+            output.append(t)
+            for v in face_list[t]:
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if time - timestamps[v] > cache_size:
+                    timestamps[v] = time
+                    time += 1
+
+        # Next fanning vertex: the candidate that stays in cache longest while it still has triangles
+        fanning = -1
+        best_priority = -1
+        for v in candidates:
+            if live[v] <= 0:
+                continue
+            priority = 0
+            if time - timestamps[v] + 2 * live[v] <= cache_size:
+                priority = time - timestamps[v]
+            if priority > best_priority:
+                best_priority = priority
+                fanning = v
+
+        if fanning == -1:
+            while dead_end:
+                v = dead_end.pop()
+                if live[v] > 0:
+                    fanning = v
+                    break
+            else:
+                while cursor < vertex_count and live[cursor] <= 0:
+                    cursor += 1
+                fanning = cursor if cursor < vertex_count else -1
+
+    return faces[np.array(output)]
+
+
+def acmr(faces, cache_size=DEFAULT_CACHE_SIZE):
+    # Average cache miss ratio: transformed vertices per triangle under a FIFO cache
+    faces = np.asarray(faces)
+    if len(faces) == 0:
+        return 0.0
+    cache = deque()
+    cached = set()
+    misses = 0
+    for v in faces.reshape(-1).tolist():
+        if v in cached:
+            continue
+        misses += 1
+        cache.append(v)
+        cached.add(v)
+        if len(cache) > cache_size:
+            cached.discard(cache.popleft())
+    return misses / len(faces)
+
+
+def optimize_mesh(vertices, faces, weld_tolerance=None, cache_size=DEFAULT_CACHE_SIZE):
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    stats = {
+        'vertices_before': len(vertices),
+        'faces_before': len(faces),
+        'acmr_before': acmr(faces, cache_size),
+    }
+
+    if weld_tolerance is None:
+        # Relative to the model size so it behaves the same in millimetres or metres
+        extent = np.linalg.norm(np.ptp(vertices, axis=0)) if len(vertices) else 0.0
+        weld_tolerance = max(extent * 1e-6, 1e-12)
+
+    vertices, faces = weld_vertices(vertices, faces, weld_tolerance)
+    welded_count = len(vertices)
+    faces = remove_degenerate_faces(vertices, faces)
+    faces = tipsify(faces, len(vertices), cache_size)
+    # Also drops vertices no remaining face uses, e.g. ones only degenerate faces referenced
+    vertices, faces = reorder_vertices_by_first_use(vertices, faces)
+
+    stats.update({
+        'vertices_welded': stats['vertices_before'] - welded_count,
+        'vertices_unreferenced': welded_count - len(vertices),
+        'vertices_after': len(vertices),
+        'faces_after': len(faces),
+        'acmr_after': acmr(faces, cache_size),
+        'cache_size': cache_size,
+    })
+    return vertices, faces, stats
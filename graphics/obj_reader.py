@@ -0,0 +1,111 @@
+import re
+import numpy as np
+
+# Streaming Wavefront OBJ reader for progressive display. Only positions and faces are
+# read; polygons are fan-triangulated. Each chunk of text is split into "v" and "f"
+# lines by regex and parsed in one go, with per-line parsing only for unusual layouts.
+# Comments ("#" to the end of the line, also after an element) are dropped first.
+
+FIRST_CHUNK_BYTES = 1 << 18
+MAX_CHUNK_BYTES = 1 << 23
+
+# Element lines may be indented
+VERTEX_LINE = re.compile(r'^[ \t]*v[ \t]+([^\n]*)', re.M)
+FACE_LINE = re.compile(r'^[ \t]*f[ \t]+([^\n]*)', re.M)
+ELEMENT_LINE = re.compile(r'^[ \t]*([vf])[ \t]', re.M)
+INDEX_SUFFIX = re.compile(r'/\S*')
+COMMENT = re.compile(r'#[^\n]*')
+
+
+def _parse_table(lines, dtype, width=None):
+    # Fixed-width rows of numbers, or None if the lines are ragged or malformed. loadtxt raises
+    # on any bad token, unlike np.fromstring's text mode, which only warns and stops early.
+    try:
+        table = np.loadtxt(lines, dtype=dtype, comments=None, ndmin=2)
+    except ValueError:
+        return None
+    if len(table) != len(lines) or (width is not None and table.shape[1] != width):
+        return None
+    return table
+
+
+def parse_vertices(lines):
+    if not lines:
+        return np.empty((0, 3))
+    # Plain "x y z" first; a ragged total falls through to the general width check
+    table = _parse_table(lines, np.float64, 3)
+    if table is None:
+        table = _parse_table(lines, np.float64)
+    if table is not None and table.shape[1] >= 3:
+        return table[:, :3]
+    return np.array([line.split()[:3] for line in lines], dtype=np.float64).reshape(-1, 3)
+
+
+def triangulate(corners):
+    # Fan triangulation of an (N, K) block of polygon corners
+    return np.concatenate([corners[:, [0, k, k + 1]] for k in range(1, corners.shape[1] - 1)])
+
+
+def parse_faces(lines, vertices_before):
+    # vertices_before(i) gives the vertex count when face line i was read, for relative indices
+    if not lines:
+        return np.empty((0, 3), dtype=np.int64)
+    lines = INDEX_SUFFIX.sub('', '\n'.join(lines)).split('\n')
+    table = _parse_table(lines, np.int64, 3)
+    if table is None:
+        table = _parse_table(lines, np.int64)
+
+    if table is not None and table.shape[1] >= 3:
+        if (table < 0).any():
+            table = np.where(table < 0, table + vertices_before()[:, None], table - 1)
+        else:
+            table = table - 1
+        return triangulate(table) if table.shape[1] > 3 else table
+
+    triangles = []
+    for line, count in zip(lines, vertices_before()):
+        corners = [int(token) for token in line.split()]
+        corners = [c + count if c < 0 else c - 1 for c in corners]
+        triangles.extend([corners[0], corners[k], corners[k + 1]] for k in range(1, len(corners) - 1))
+    return np.array(triangles, dtype=np.int64).reshape(-1, 3)
+
+
+def read_obj_batches(filename, first_chunk_bytes=FIRST_CHUNK_BYTES, max_chunk_bytes=MAX_CHUNK_BYTES):
+    # Yields (vertices, faces) per chunk of the file; face indices are global and 0-based.
+    # The first chunk is small so something can be drawn almost immediately, later ones
+    # grow to keep the per-batch overhead low.
+    vertex_count = 0
+    chunk_bytes = first_chunk_bytes
+    remainder = b''
+    with open(filename, 'rb') as f:
+        while True:
+            data = f.read(chunk_bytes)
+            chunk_bytes = min(chunk_bytes * 2, max_chunk_bytes)
+            if data:
+                data = remainder + data
+                cut = data.rfind(b'\n') + 1
+                if cut == 0:
+                    remainder = data
+                    continue
+                data, remainder = data[:cut], data[cut:]
+            elif remainder:
+                data, remainder = remainder + b'\n', b''
+            else:
+                return
+
+            text = data.decode('utf-8', errors='replace')
+            if '#' in text:
+                text = COMMENT.sub('', text)
+
+            def vertices_before(base=vertex_count):
+                # Only needed for negative indices: vertex count at each face line of this chunk
+                kinds = np.array([m.group(1) == 'v' for m in ELEMENT_LINE.finditer(text)])
+                return base + np.cumsum(kinds)[~kinds]
+
+            vertices = parse_vertices(VERTEX_LINE.findall(text))
+            faces = parse_faces(FACE_LINE.findall(text), vertices_before)
+            vertex_count += len(vertices)
+            if len(faces) and (faces.min() < 0 or faces.max() >= vertex_count):
+                raise ValueError(f"Face refers to a vertex that is not defined ({filename})")
+            if len(vertices) or len(faces):
+                yield vertices, faces
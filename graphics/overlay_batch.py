@@ -0,0 +1,72 @@
+import numpy as np
+
+LINES = 0
+POINTS = 1
+
+
+class OverlayGroup:
+    def __init__(self, on_top, layer, primitive, size, first, count):
+        self.on_top = on_top
+        self.layer = layer
+        self.primitive = primitive
+        self.size = size
+        self.first = first
+        self.count = count
+
+
+class OverlayBatch:
+    # Collects overlay lines and points for a frame, then packs them into one vertex array
+    # grouped by render state so a renderer switches depth test / width / size as rarely as possible.
+
+    def __init__(self):
+        self._pending = {}
+        self.positions = None
+        self.colors = None
+        self.groups = []
+
+    def _add(self, primitive, points, color, size, on_top, layer):
+        key = (on_top, layer, primitive, -size)
+        positions, colors = self._pending.setdefault(key, ([], []))
+        positions.extend(points)
+        colors.extend([color] * len(points))
+
+    def lines(self, points, color, width, on_top=False, layer=0):
+        # Pairs of endpoints, as with GL_LINES
+        self._add(LINES, points, color, width, on_top, layer)
+
+    def line_strip(self, points, color, width, on_top=False, layer=0):
+        segments = []
+        for start, end in zip(points[:-1], points[1:]):
+            segments.extend([start, end])
+        self.lines(segments, color, width, on_top, layer)
+
+    def line_loop(self, points, color, width, on_top=False, layer=0):
+        self.line_strip(list(points) + [points[0]], color, width, on_top, layer)
+
+    def points(self, points, color, size, on_top=False, layer=0):
+        self._add(POINTS, points, color, size, on_top, layer)
+
+    def finish(self):
+        # Depth-tested groups first, then on-top ones; within those, by layer, lines before
+        # points, and larger points first so smaller ones land on top of them
+        positions = []
+        colors = []
+        self.groups = []
+        first = 0
+        for key in sorted(self._pending):
+            on_top, layer, primitive, negative_size = key
+            group_positions, group_colors = self._pending[key]
+            if not group_positions:
+                continue
+            positions.extend(group_positions)
+            colors.extend(group_colors)
+            self.groups.append(OverlayGroup(on_top, layer, primitive, -negative_size, first, len(group_positions)))
+            first += len(group_positions)
+
+        self.positions = np.array(positions, dtype=np.float32).reshape(-1, 3)
+        self.colors = np.array(colors, dtype=np.float32).reshape(-1, 3)
+        self._pending = {}
+        return self
+
+    def interleaved(self):
+        return np.ascontiguousarray(np.hstack([self.positions, self.colors]))
@@ -0,0 +1,115 @@
+import numpy as np
+from graphics.gl_buffer import VertexBuffer
+
+DEFAULT_POINT_BUDGET = 250000
+
+
+def stratified_sample(vertices, budget, seed=0, oversample=4):
+    # Sorted indices of at most `budget` vertices spread evenly over the model: a random
+    # candidate pool is bucketed into a grid and each occupied cell contributes one vertex,
+    # so flat or dense regions don't eat the whole budget the way a plain random pick does
+    count = len(vertices)
+    if budget >= count:
+        return np.arange(count)
+
+    # The pool keeps the cost proportional to the budget rather than the mesh size
+    rng = np.random.default_rng(seed)
+    pool = rng.choice(count, size=min(count, budget * oversample), replace=False)
+    points = np.asarray(vertices[pool], dtype=np.float64)
+    lower = points.min(axis=0)
+    extent = np.ptp(points, axis=0).max()
+    if extent == 0:
+        return np.sort(pool[:budget])
+
+    # Scans are surfaces, so occupied cells grow roughly with the square of the resolution
+    resolution = np.sqrt(budget)
+    for _ in range(2):
+        resolution = min(resolution, 1e6)
+        cells = np.floor((points - lower) * (resolution / extent)).astype(np.int64)
+        side = int(resolution) + 1
+        keys = (cells[:, 0] * side + cells[:, 1]) * side + cells[:, 2]
+        _, chosen = np.unique(keys, return_index=True)
+        resolution *= np.sqrt(budget / len(chosen))
+
+    # The pool is in random order, so the first candidate in a cell is a random one
+    if len(chosen) > budget:
+        chosen = rng.choice(chosen, size=budget, replace=False)
+    elif len(chosen) < budget:
+        rest = np.setdiff1d(np.arange(len(pool)), chosen, assume_unique=True)
+        chosen = np.concatenate([chosen, rng.permutation(rest)[:budget - len(chosen)]])
+    return np.sort(pool[chosen])
+
+
+def adjacent_faces(faces, indices, vertex_count, chunk_size=1 << 20):
+    # One face touching each requested vertex (-1 if none), scanning the index buffer in chunks
+    slot = np.full(vertex_count, -1, dtype=np.int32)
+    slot[indices] = np.arange(len(indices))
+    found = np.full(len(indices), -1, dtype=np.int64)
+    for start in range(0, len(faces), chunk_size):
+        chunk = np.asarray(faces[start:start + chunk_size])
+        for corner in range(3):
+            hits = slot[chunk[:, corner]]
+            rows = np.flatnonzero(hits >= 0)
+            found[hits[rows]] = start + rows
+        if found.min(initial=0) >= 0:
+            break
+    return found
+
+
+class PointCloud(VertexBuffer):
+    def __init__(self, positions, normals):
+        super().__init__()
+        self.positions = np.ascontiguousarray(positions, dtype=np.float32)
+        self.normals = np.ascontiguousarray(normals, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def host_arrays(self):
+        arrays = super().host_arrays()
+        arrays['vertices'] = [self.positions]
+        arrays['normals'] = [self.normals]
+        return arrays
+
+    def rotated(self, q):
+        # Preview of a rotation: only the sampled points are transformed
+        return PointCloud(q.rotate_vertices(self.positions), q.rotate_vertices(self.normals))
+
+    def draw_length(self):
+        return len(self.positions)
+
+    def draw_buffer(self, first_row=0):
+        return np.hstack([self.positions[first_row:], self.normals[first_row:]])
+
+    def draw_bound(self):
+        from OpenGL.GL import glDrawArrays, GL_POINTS
+        glDrawArrays(GL_POINTS, 0, self._vertex_count)
+
+
+class LoadingPointCloud(PointCloud):
+    # Vertices of a file that is still being read, shown before its faces arrive. Keeps every
+    # stride-th vertex of the stream and doubles the stride whenever the budget fills up.
+    growable = True
+
+    def __init__(self, budget=DEFAULT_POINT_BUDGET):
+        super().__init__(np.empty((0, 3)), np.empty((0, 3)))
+        self.budget = budget
+        self.stride = 1
+        self._seen = 0
+
+    def extend(self, vertices):
+        start = -self._seen % self.stride
+        self._seen += len(vertices)
+        positions = np.vstack([self.positions, np.asarray(vertices[start::self.stride], dtype=np.float32)])
+        thinned = False
+        while len(positions) > self.budget:
+            positions = positions[::2]
+            self.stride *= 2
+            thinned = True
+        if thinned:
+            # Every kept row moved, so the next upload starts over
+            self._vertex_count = 0
+
+        # No faces yet, so no normals: the renderers light these with the ambient term only
+        self.positions = positions
+        self.normals = np.zeros_like(positions)
@@ -0,0 +1,348 @@
+from OpenGL.GL import *
+from OpenGL.error import GLError
+from graphics.overlay_batch import LINES
+import ctypes
+import os
+import numpy as np
+
+# Set QUATERNION_VISUALIZER_RENDERER=fixed to force the fixed-function path
+RENDERER_ENV = "QUATERNION_VISUALIZER_RENDERER"
+
+LIGHT_POSITION = (2.0, 2.0, 2.0, 1.0)  # Eye space, like the original glLightfv call
+LIGHT_AMBIENT = (0.3, 0.3, 0.3, 1.0)
+LIGHT_DIFFUSE = (0.8, 0.8, 0.8, 1.0)
+LIGHT_SPECULAR = (1.0, 1.0, 1.0, 1.0)
+SCENE_AMBIENT = (0.2, 0.2, 0.2, 1.0)  # OpenGL's default GL_LIGHT_MODEL_AMBIENT
+
+CAMERA_BLOCK = """
+layout(std140, row_major) uniform Camera {
+    mat4 projection;
+    mat4 view;
+    vec4 light_position;
+    vec4 light_ambient;
+    vec4 light_diffuse;
+    vec4 scene_ambient;
+};
+"""
+
+MESH_VERTEX_SHADER = """#version 330 core
+""" + CAMERA_BLOCK + """
+uniform mat4 model;
+uniform float point_size;
+layout(location = 0) in vec3 position;
+layout(location = 1) in vec3 normal;
+out vec3 eye_position;
+out vec3 eye_normal;
+
+void main() {
+    mat4 model_view = view * model;
+    vec4 eye = model_view * vec4(position, 1.0);
+    eye_position = eye.xyz;
+    eye_normal = mat3(model_view) * normal;
+    gl_PointSize = point_size;
+    gl_Position = projection * eye;
+}
+"""
+
+MESH_FRAGMENT_SHADER = """#version 330 core
+""" + CAMERA_BLOCK + """
+uniform vec3 color;
+uniform bool derivative_normals;
+in vec3 eye_position;
+in vec3 eye_normal;
+out vec4 frag_color;
+
+void main() {
+    // Same terms as the fixed-function setup (color material, no specular), evaluated per pixel
+    vec3 n;
+    if (derivative_normals) {
+        // Indexed meshes share vertices between faces; the flat face normal comes from the
+        // screen-space derivatives, facing the viewer, and is flipped for back faces
+        n = normalize(cross(dFdx(eye_position), dFdy(eye_position)));
+        n = gl_FrontFacing ? n : -n;
+    } else {
+        // Points without a normal (no faces loaded yet) only get the ambient terms
+        n = dot(eye_normal, eye_normal) > 0.0 ? normalize(eye_normal) : vec3(0.0);
+    }
+    vec3 l = normalize(light_position.xyz - eye_position);
+    float diffuse = max(dot(n, l), 0.0);
+    vec3 lit = color * (scene_ambient.rgb + light_ambient.rgb + light_diffuse.rgb * diffuse);
+    frag_color = vec4(min(lit, vec3(1.0)), 1.0);
+}
+"""
+
+OVERLAY_VERTEX_SHADER = """#version 330 core
+""" + CAMERA_BLOCK + """
+uniform float point_size;
+layout(location = 0) in vec3 position;
+layout(location = 1) in vec3 vertex_color;
+out vec3 color;
+
+void main() {
+    color = vertex_color;
+    gl_PointSize = point_size;
+    gl_Position = projection * view * vec4(position, 1.0);
+}
+"""
+
+OVERLAY_FRAGMENT_SHADER = """#version 330 core
+in vec3 color;
+out vec4 frag_color;
+
+void main() {
+    frag_color = vec4(color, 1.0);
+}
+"""
+
+
+class FixedFunctionRenderer:
+    name = "fixed-function"
+    # Per-face normals need de-indexed triangles here, so optimized meshes lose their face order benefit
+    draws_indexed = False
+
+    def initialize(self):
+        glEnable(GL_DEPTH_TEST)
+        glEnable(GL_LIGHTING)
+        glEnable(GL_LIGHT0)
+        glEnable(GL_COLOR_MATERIAL)
+        glColorMaterial(GL_FRONT_AND_BACK, GL_AMBIENT_AND_DIFFUSE)
+
+        # Set up lighting (modelview is identity here, so the position is in eye space)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        glLightfv(GL_LIGHT0, GL_POSITION, LIGHT_POSITION)
+        glLightfv(GL_LIGHT0, GL_AMBIENT, LIGHT_AMBIENT)
+        glLightfv(GL_LIGHT0, GL_DIFFUSE, LIGHT_DIFFUSE)
+        glLightfv(GL_LIGHT0, GL_SPECULAR, LIGHT_SPECULAR)
+        return self
+
+    def begin_frame(self, projection, view):
+        glMatrixMode(GL_PROJECTION)
+        glLoadTransposeMatrixd(projection)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadTransposeMatrixd(view)
+        glEnable(GL_LIGHTING)
+
+    def set_point_size(self, size):
+        glPointSize(size)
+
+    def draw_mesh(self, mesh, color, model=None):
+        glColor3f(*color)
+        if model is None:
+            mesh.draw()
+            return
+        glPushMatrix()
+        glMultTransposeMatrixd(model)
+        mesh.draw()
+        glPopMatrix()
+
+    def draw_mesh_instances(self, mesh, color, models, viewports):
+        # One buffer bind for the whole grid; per instance only viewport and model matrix change
+        glColor3f(*color)
+        mesh.bind()
+        for model, viewport in zip(models, viewports):
+            glViewport(*viewport)
+            glPushMatrix()
+            glMultTransposeMatrixd(model)
+            mesh.draw_bound()
+            glPopMatrix()
+        mesh.unbind()
+
+    def draw_overlays(self, batch):
+        if not batch.groups:
+            return
+        glDisable(GL_LIGHTING)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, batch.positions)
+        glColorPointer(3, GL_FLOAT, 0, batch.colors)
+
+        on_top = False
+        for group in batch.groups:
+            if group.on_top != on_top:
+                on_top = group.on_top
+                if on_top:
+                    glDisable(GL_DEPTH_TEST)
+                else:
+                    glEnable(GL_DEPTH_TEST)
+            if group.primitive == LINES:
+                glLineWidth(group.size)
+                glDrawArrays(GL_LINES, group.first, group.count)
+            else:
+                glPointSize(group.size)
+                glDrawArrays(GL_POINTS, group.first, group.count)
+
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glEnable(GL_DEPTH_TEST)
+        glLineWidth(1.0)
+        glPointSize(1.0)
+
+    def end_frame(self):
+        pass
+
+
+class ShaderRenderer:
+    name = "shader"
+    draws_indexed = True
+
+    def initialize(self):
+        version = glGetString(GL_SHADING_LANGUAGE_VERSION)
+        if not version:
+            raise RuntimeError("GLSL is not available")
+        major, minor = (int(part) for part in version.decode().split()[0].split('.')[:2])
+        if (major, minor) < (3, 30):
+            raise RuntimeError(f"GLSL 3.30 required, found {version.decode()}")
+
+        self.mesh_program = link_program(MESH_VERTEX_SHADER, MESH_FRAGMENT_SHADER)
+        self.overlay_program = link_program(OVERLAY_VERTEX_SHADER, OVERLAY_FRAGMENT_SHADER)
+        self.model_location = glGetUniformLocation(self.mesh_program, "model")
+        self.color_location = glGetUniformLocation(self.mesh_program, "color")
+        self.derivative_normals_location = glGetUniformLocation(self.mesh_program, "derivative_normals")
+        self.mesh_point_size_location = glGetUniformLocation(self.mesh_program, "point_size")
+        self.overlay_point_size_location = glGetUniformLocation(self.overlay_program, "point_size")
+
+        # Camera and light live in one uniform buffer shared by both programs
+        for program in (self.mesh_program, self.overlay_program):
+            glUniformBlockBinding(program, glGetUniformBlockIndex(program, "Camera"), 0)
+        self.camera_buffer = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.camera_buffer)
+        glBufferData(GL_UNIFORM_BUFFER, 2 * 64 + 4 * 16, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glBindBufferBase(GL_UNIFORM_BUFFER, 0, self.camera_buffer)
+
+        self.overlay_vao = glGenVertexArrays(1)
+        self.overlay_buffer = glGenBuffers(1)
+        glBindVertexArray(self.overlay_vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.overlay_buffer)
+        glEnableVertexAttribArray(0)
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 24, ctypes.c_void_p(0))
+        glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 24, ctypes.c_void_p(12))
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self._uploaded_batch = None
+
+        # Wide lines are optional in core profiles; clamp to what the driver reports
+        self.max_line_width = float(glGetFloatv(GL_ALIASED_LINE_WIDTH_RANGE)[1])
+        glEnable(GL_PROGRAM_POINT_SIZE)
+        glEnable(GL_DEPTH_TEST)
+
+        self._program = None
+        self._line_width = None
+        return self
+
+    def use_program(self, program):
+        if program != self._program:
+            glUseProgram(program)
+            self._program = program
+
+    def set_line_width(self, width):
+        width = min(width, self.max_line_width)
+        if width != self._line_width:
+            glLineWidth(width)
+            self._line_width = width
+
+    def begin_frame(self, projection, view):
+        camera = np.concatenate([
+            projection.astype(np.float32).ravel(),
+            view.astype(np.float32).ravel(),
+            np.array(LIGHT_POSITION + LIGHT_AMBIENT + LIGHT_DIFFUSE + SCENE_AMBIENT, dtype=np.float32),
+        ])
+        glBindBuffer(GL_UNIFORM_BUFFER, self.camera_buffer)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, camera.nbytes, camera)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+
+    def set_point_size(self, size):
+        # Only point clouds read it; triangles drawn with the mesh program ignore gl_PointSize
+        self.use_program(self.mesh_program)
+        glUniform1f(self.mesh_point_size_location, size)
+
+    def draw_mesh(self, mesh, color, model=None):
+        self.use_program(self.mesh_program)
+        glUniformMatrix4fv(self.model_location, 1, GL_TRUE, np.identity(4, dtype=np.float32) if model is None else model.astype(np.float32))
+        glUniform3f(self.color_location, *color)
+        mesh.bind_vertex_array()
+        glUniform1i(self.derivative_normals_location, mesh.uses_indices())
+        mesh.draw_bound()
+
+    def draw_mesh_instances(self, mesh, color, models, viewports):
+        self.use_program(self.mesh_program)
+        glUniform3f(self.color_location, *color)
+        mesh.bind_vertex_array()
+        glUniform1i(self.derivative_normals_location, mesh.uses_indices())
+        for model, viewport in zip(models.astype(np.float32), viewports):
+            glViewport(*viewport)
+            glUniformMatrix4fv(self.model_location, 1, GL_TRUE, model)
+            mesh.draw_bound()
+
+    def draw_overlays(self, batch):
+        if not batch.groups:
+            return
+        self.use_program(self.overlay_program)
+        glBindVertexArray(self.overlay_vao)
+
+        # Overlay geometry only changes with the rotation parameters, so re-upload only then
+        if batch is not self._uploaded_batch:
+            data = batch.interleaved()
+            glBindBuffer(GL_ARRAY_BUFFER, self.overlay_buffer)
+            glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_DYNAMIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            self._uploaded_batch = batch
+
+        on_top = False
+        for group in batch.groups:
+            if group.on_top != on_top:
+                on_top = group.on_top
+                if on_top:
+                    glDisable(GL_DEPTH_TEST)
+                else:
+                    glEnable(GL_DEPTH_TEST)
+            if group.primitive == LINES:
+                self.set_line_width(group.size)
+                glDrawArrays(GL_LINES, group.first, group.count)
+            else:
+                glUniform1f(self.overlay_point_size_location, group.size)
+                glDrawArrays(GL_POINTS, group.first, group.count)
+        glEnable(GL_DEPTH_TEST)
+
+    def end_frame(self):
+        glBindVertexArray(0)
+        self.use_program(0)
+
+
+def compile_shader(source, shader_type):
+    shader = glCreateShader(shader_type)
+    glShaderSource(shader, source)
+    glCompileShader(shader)
+    if not glGetShaderiv(shader, GL_COMPILE_STATUS):
+        log = glGetShaderInfoLog(shader)
+        glDeleteShader(shader)
+        raise RuntimeError(f"Shader compilation failed: {log.decode() if isinstance(log, bytes) else log}")
+    return shader
+
+
+def link_program(vertex_source, fragment_source):
+    # Linked by hand: PyOpenGL's compileProgram also validates, which fails in core profiles without a bound VAO
+    shaders = [compile_shader(vertex_source, GL_VERTEX_SHADER), compile_shader(fragment_source, GL_FRAGMENT_SHADER)]
+    program = glCreateProgram()
+    for shader in shaders:
+        glAttachShader(program, shader)
+    glLinkProgram(program)
+    for shader in shaders:
+        glDetachShader(program, shader)
+        glDeleteShader(shader)
+    if not glGetProgramiv(program, GL_LINK_STATUS):
+        log = glGetProgramInfoLog(program)
+        glDeleteProgram(program)
+        raise RuntimeError(f"Program link failed: {log.decode() if isinstance(log, bytes) else log}")
+    return program
+
+
+def create_renderer():
+    if os.environ.get(RENDERER_ENV, "").lower() != "fixed":
+        try:
+            return ShaderRenderer().initialize()
+        except (RuntimeError, GLError, ValueError) as e:
+            print(f"Renderer: shader path unavailable ({e}), falling back to fixed-function")
+    return FixedFunctionRenderer().initialize()
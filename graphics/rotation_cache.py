@@ -0,0 +1,82 @@
+from collections import OrderedDict
+import weakref
+import numpy as np
+
+
+class RotationCache:
+    def __init__(self, budget_bytes=256 * 1024 * 1024, quantization=1e-4):
+        self.budget_bytes = budget_bytes
+        self.quantization = quantization
+        self._entries = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, mesh, q):
+        components = np.array([q.w, q.x, q.y, q.z], dtype=np.float64)
+        norm = np.linalg.norm(components)
+        if norm == 0:
+            return None
+        components /= norm
+
+        # q and -q describe the same rotation, so pick the one with a positive leading component
+        leading = components[np.flatnonzero(np.abs(components) > self.quantization)[0]]
+        if leading < 0:
+            components = -components
+
+        quantized = tuple(int(c) for c in np.round(components / self.quantization))
+        return (id(mesh), quantized)
+
+    def get(self, mesh, q):
+        key = self.make_key(mesh, q)
+        entry = self._entries.get(key)
+        # id() can be reused once a mesh is freed, so confirm the mesh is the same object
+        if entry is None or entry[0]() is not mesh:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, mesh, q, vertices):
+        key = self.make_key(mesh, q)
+        if key is None:
+            return
+        vertices = np.asarray(vertices)
+        if vertices.nbytes > self.budget_bytes:
+            return
+
+        # Cached arrays are shared between rotated meshes, never modified in place
+        vertices.setflags(write=False)
+
+        if key in self._entries:
+            self.used_bytes -= self._entries.pop(key)[1].nbytes
+        self._entries[key] = (weakref.ref(mesh), vertices)
+        self.used_bytes += vertices.nbytes
+
+        while self.used_bytes > self.budget_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.used_bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def discard_mesh(self, mesh):
+        for key in [k for k, entry in self._entries.items() if entry[0]() is mesh or entry[0]() is None]:
+            self.used_bytes -= self._entries.pop(key)[1].nbytes
+
+    def arrays(self, mesh=None):
+        # Cached vertex sets, optionally only those of one mesh
+        return [vertices for ref, vertices in self._entries.values() if mesh is None or ref() is mesh]
+
+    def clear(self):
+        self._entries.clear()
+        self.used_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats_text(self):
+        return (
+            f"Cache: {self.hits} hits, {self.misses} misses, {self.evictions} evictions, "
+            f"{self.used_bytes / (1024 * 1024):.1f}/{self.budget_bytes / (1024 * 1024):.0f} MB"
+        )
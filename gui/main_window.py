@@ -1,8 +1,15 @@
 from PyQt5.QtWidgets import (QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout, 
                              QWidget, QLineEdit, QLabel, QFileDialog, QStatusBar, 
-                             QGroupBox, QGridLayout, QSlider, QDoubleSpinBox, QCheckBox)
+                             QGroupBox, QGridLayout, QSlider, QDoubleSpinBox, QCheckBox,
+                             QSpinBox, QComboBox)
 from PyQt5.QtCore import Qt
 from gui.opengl_widget import GLWidget
+from gui.memory_panel import MemoryPanel
+from playback.player import OrientationPlayer
+from graphics.mesh_export import EXPORT_FORMATS
+from math3d.batch import axis_angle_to_quaternions, random_quaternions
+import numpy as np
+import time
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -23,6 +30,20 @@ class MainWindow(QMainWindow):
         # Create OpenGL widget (main view)
         self.opengl_widget = GLWidget()
         self.opengl_widget.setMinimumSize(600, 400)
+        self.opengl_widget.preview_frame_displayed.connect(self.on_preview_frame_displayed)
+        self.opengl_widget.grid_frame_rendered.connect(self.on_grid_frame_rendered)
+        self.opengl_widget.mesh_load_progress.connect(self.on_mesh_load_progress)
+        self.opengl_widget.mesh_load_finished.connect(self.on_mesh_load_finished)
+        self.opengl_widget.model_library.mesh_prefetched.connect(self.on_model_prefetched)
+        self._loading_name = None
+        self._first_batch_ms = None
+        self._object_name = None
+        self.memory_panel = None
+        
+        # Plays recorded or streamed orientations through the OpenGL widget
+        self.orientation_player = OrientationPlayer(self.opengl_widget, parent=self)
+        self.orientation_player.position_changed.connect(self.on_playback_position_changed)
+        self.orientation_player.playing_changed.connect(self.on_playback_state_changed)
         
         # Create control panel
         control_panel = self.create_control_panel()
@@ -47,6 +68,48 @@ class MainWindow(QMainWindow):
         self.load_button.clicked.connect(self.load_obj)
         file_layout.addWidget(self.load_button)
         
+        # Step through the .obj files of the loaded model's directory; neighbours are prefetched
+        browse_layout = QHBoxLayout()
+        self.previous_model_button = QPushButton("◀ Previous")
+        self.previous_model_button.clicked.connect(lambda: self.show_neighbour_model(-1))
+        browse_layout.addWidget(self.previous_model_button)
+        self.next_model_button = QPushButton("Next ▶")
+        self.next_model_button.clicked.connect(lambda: self.show_neighbour_model(1))
+        browse_layout.addWidget(self.next_model_button)
+        file_layout.addLayout(browse_layout)
+        
+        library = self.opengl_widget.model_library
+        budget_layout = QGridLayout()
+        budget_layout.addWidget(QLabel("Library RAM (MB):"), 0, 0)
+        self.library_ram_input = QSpinBox()
+        self.library_ram_input.setRange(64, 262144)
+        self.library_ram_input.setValue(library.ram_budget_bytes // (1024 * 1024))
+        self.library_ram_input.setKeyboardTracking(False)
+        self.library_ram_input.valueChanged.connect(self.update_library_budgets)
+        budget_layout.addWidget(self.library_ram_input, 0, 1)
+        budget_layout.addWidget(QLabel("Library GPU (MB):"), 1, 0)
+        self.library_gpu_input = QSpinBox()
+        self.library_gpu_input.setRange(32, 65536)
+        self.library_gpu_input.setValue(library.gpu_budget_bytes // (1024 * 1024))
+        self.library_gpu_input.setKeyboardTracking(False)
+        self.library_gpu_input.valueChanged.connect(self.update_library_budgets)
+        budget_layout.addWidget(self.library_gpu_input, 1, 1)
+        file_layout.addLayout(budget_layout)
+        
+        # Weld duplicate vertices and reorder faces for the vertex cache while loading
+        self.optimize_checkbox = QCheckBox("Optimize mesh on load")
+        self.optimize_checkbox.setChecked(False)
+        file_layout.addWidget(self.optimize_checkbox)
+        
+        # Show .obj files while they are still being read (not combined with optimization)
+        self.progressive_checkbox = QCheckBox("Progressive loading")
+        self.progressive_checkbox.setChecked(False)
+        file_layout.addWidget(self.progressive_checkbox)
+        
+        self.export_button = QPushButton("Export Rotated Object")
+        self.export_button.clicked.connect(self.export_rotated_obj)
+        file_layout.addWidget(self.export_button)
+        
         # Object info label
         self.object_info_label = QLabel("No object loaded")
         self.object_info_label.setWordWrap(True)
@@ -102,6 +165,15 @@ class MainWindow(QMainWindow):
         self.rotate_button.clicked.connect(self.apply_rotation)
         rotation_layout.addWidget(self.rotate_button, 5, 0, 1, 2)
         
+        # Live preview recomputes the rotation on a worker thread as inputs change
+        self.live_preview_checkbox = QCheckBox("Live Preview")
+        self.live_preview_checkbox.setChecked(False)
+        self.live_preview_checkbox.stateChanged.connect(self.on_live_preview_toggled)
+        rotation_layout.addWidget(self.live_preview_checkbox, 6, 0, 1, 2)
+        
+        for spinbox in (self.axis_x_input, self.axis_y_input, self.axis_z_input, self.angle_input):
+            spinbox.valueChanged.connect(self.on_rotation_input_changed)
+        
         layout.addWidget(rotation_group)
         
         # Visualization controls group
@@ -139,8 +211,100 @@ class MainWindow(QMainWindow):
         self.show_angle_label_checkbox.stateChanged.connect(self.update_visualizations)
         viz_layout.addWidget(self.show_angle_label_checkbox)
         
+        # Massive meshes: draw a stratified vertex subsample as points instead of triangles
+        self.point_cloud_checkbox = QCheckBox("Point Cloud Mode")
+        self.point_cloud_checkbox.setChecked(False)
+        self.point_cloud_checkbox.stateChanged.connect(self.update_point_cloud_mode)
+        viz_layout.addWidget(self.point_cloud_checkbox)
+        
+        point_layout = QGridLayout()
+        point_layout.addWidget(QLabel("Point budget:"), 0, 0)
+        self.point_budget_input = QSpinBox()
+        self.point_budget_input.setRange(1000, 10000000)
+        self.point_budget_input.setSingleStep(50000)
+        self.point_budget_input.setValue(self.opengl_widget.point_budget)
+        self.point_budget_input.setKeyboardTracking(False)
+        self.point_budget_input.valueChanged.connect(self.update_point_cloud_mode)
+        point_layout.addWidget(self.point_budget_input, 0, 1)
+        
+        point_layout.addWidget(QLabel("Point size:"), 1, 0)
+        self.point_size_input = QDoubleSpinBox()
+        self.point_size_input.setRange(1.0, 10.0)
+        self.point_size_input.setValue(self.opengl_widget.point_size)
+        self.point_size_input.setDecimals(1)
+        self.point_size_input.setSingleStep(0.5)
+        self.point_size_input.valueChanged.connect(self.update_point_cloud_mode)
+        point_layout.addWidget(self.point_size_input, 1, 1)
+        viz_layout.addLayout(point_layout)
+        
         layout.addWidget(viz_group)
         
+        # Comparison grid group
+        grid_group = QGroupBox("Comparison Grid")
+        grid_layout = QGridLayout(grid_group)
+        
+        self.show_grid_checkbox = QCheckBox("Show Comparison Grid")
+        self.show_grid_checkbox.setChecked(False)
+        self.show_grid_checkbox.stateChanged.connect(self.update_comparison_grid)
+        grid_layout.addWidget(self.show_grid_checkbox, 0, 0, 1, 2)
+        
+        grid_layout.addWidget(QLabel("Rotations:"), 1, 0)
+        self.grid_count_input = QSpinBox()
+        self.grid_count_input.setRange(1, 1024)
+        self.grid_count_input.setValue(16)
+        self.grid_count_input.valueChanged.connect(self.update_comparison_grid)
+        grid_layout.addWidget(self.grid_count_input, 1, 1)
+        
+        self.grid_mode_input = QComboBox()
+        self.grid_mode_input.addItems(["Sweep around axis", "Random rotations"])
+        self.grid_mode_input.currentIndexChanged.connect(self.update_comparison_grid)
+        grid_layout.addWidget(self.grid_mode_input, 2, 0, 1, 2)
+        
+        layout.addWidget(grid_group)
+        
+        # Orientation playback group
+        playback_group = QGroupBox("Orientation Playback")
+        playback_layout = QGridLayout(playback_group)
+        
+        self.open_log_button = QPushButton("Open Orientation Log")
+        self.open_log_button.clicked.connect(self.open_orientation_log)
+        playback_layout.addWidget(self.open_log_button, 0, 0, 1, 2)
+        
+        self.listen_button = QPushButton("Listen on Port")
+        self.listen_button.clicked.connect(self.listen_orientation_stream)
+        playback_layout.addWidget(self.listen_button, 1, 0)
+        self.port_input = QSpinBox()
+        self.port_input.setRange(1024, 65535)
+        self.port_input.setValue(5555)
+        playback_layout.addWidget(self.port_input, 1, 1)
+        
+        self.play_button = QPushButton("Play")
+        self.play_button.clicked.connect(self.toggle_playback)
+        playback_layout.addWidget(self.play_button, 2, 0)
+        self.stop_playback_button = QPushButton("Stop")
+        self.stop_playback_button.clicked.connect(self.stop_playback)
+        playback_layout.addWidget(self.stop_playback_button, 2, 1)
+        
+        playback_layout.addWidget(QLabel("Speed (x):"), 3, 0)
+        self.speed_input = QDoubleSpinBox()
+        self.speed_input.setRange(0.1, 1000.0)
+        self.speed_input.setValue(1.0)
+        self.speed_input.setDecimals(1)
+        self.speed_input.valueChanged.connect(self.orientation_player.set_speed)
+        playback_layout.addWidget(self.speed_input, 3, 1)
+        
+        # Slider positions are thousandths of the log duration
+        self.seek_slider = QSlider(Qt.Horizontal)
+        self.seek_slider.setRange(0, 1000)
+        self.seek_slider.sliderMoved.connect(self.seek_playback)
+        playback_layout.addWidget(self.seek_slider, 4, 0, 1, 2)
+        
+        self.playback_info_label = QLabel("No orientation source")
+        self.playback_info_label.setWordWrap(True)
+        playback_layout.addWidget(self.playback_info_label, 5, 0, 1, 2)
+        
+        layout.addWidget(playback_group)
+        
         # View controls group
         view_group = QGroupBox("View Controls")
         view_layout = QVBoxLayout(view_group)
@@ -149,6 +313,10 @@ class MainWindow(QMainWindow):
         self.reset_button.clicked.connect(self.opengl_widget.reset_view)
         view_layout.addWidget(self.reset_button)
         
+        self.memory_button = QPushButton("Memory Report")
+        self.memory_button.clicked.connect(self.show_memory_panel)
+        view_layout.addWidget(self.memory_button)
+        
         help_label = QLabel("Mouse Controls:\n• Left drag: Rotate view\n• Wheel: Zoom in/out")
         help_label.setStyleSheet("color: gray; font-size: 10px;")
         view_layout.addWidget(help_label)
@@ -167,28 +335,135 @@ class MainWindow(QMainWindow):
             "OBJ Files (*.obj);;All Files (*)"
         )
         if filename:
-            self.status_bar.showMessage("Loading object...")
-            success = self.opengl_widget.load_mesh(filename)
+            self.open_model(filename)
+
+    def show_neighbour_model(self, step):
+        library = self.opengl_widget.model_library
+        current = library.current_filename()
+        if current is None:
+            self.status_bar.showMessage("Please load an object first")
+            return
+        filename = library.neighbour(current, step)
+        if filename is not None and filename != current:
+            self.open_model(filename)
+
+    def open_model(self, filename):
+        import os
+        obj_name = os.path.basename(filename)
+        optimize = self.optimize_checkbox.isChecked()
+        library = self.opengl_widget.model_library
+        progressive = (self.progressive_checkbox.isChecked() and not optimize
+                       and filename.lower().endswith('.obj'))
+        # A model already in the library is shown directly, progressive or not
+        pooled_progressive = progressive and library.contains(filename, progressive=True)
+        if progressive and not pooled_progressive and not library.contains(filename):
+            self._loading_name = obj_name
+            self._first_batch_ms = None
+            self.status_bar.showMessage(f"Loading {obj_name} progressively...")
+            self.object_info_label.setText(f"Loading: {obj_name}")
+            self.opengl_widget.load_mesh_progressive(filename)
+            return
+            
+        self.status_bar.showMessage("Loading object...")
+        start = time.perf_counter()
+        success = self.opengl_widget.load_mesh(filename, optimize=optimize, progressive=pooled_progressive)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if success is None:
+            # Already being loaded in the background; on_mesh_load_finished reports it
+            self._loading_name = obj_name
+            self._first_batch_ms = None
+            self.status_bar.showMessage(f"Loading {obj_name} in the background...")
+        elif success and self.opengl_widget.mesh:
+            self.show_object_info(obj_name)
+            self.status_bar.showMessage(
+                f"Successfully loaded {obj_name} in {elapsed_ms:.0f} ms | {library.stats_text()}"
+            )
+        else:
+            self.object_info_label.setText("Failed to load object")
+            self.status_bar.showMessage("Failed to load object")
+
+    def show_object_info(self, obj_name):
+        vertex_count = len(self.opengl_widget.mesh.vertices)
+        face_count = len(self.opengl_widget.mesh.faces)
+        info = (
+            f"Loaded: {obj_name}\n"
+            f"Vertices: {vertex_count:,}\n"
+            f"Faces: {face_count:,}"
+        )
+        stats = self.opengl_widget.mesh.optimization_stats
+        if stats:
+            info += (
+                f"\nVertices: {stats['vertices_before']:,} → {stats['vertices_after']:,} "
+                f"({stats['vertices_welded']:,} welded, {stats['vertices_unreferenced']:,} unreferenced)\n"
+                f"Degenerate faces removed: {stats['faces_before'] - stats['faces_after']:,}\n"
+                f"ACMR: {stats['acmr_before']:.2f} → {stats['acmr_after']:.2f}"
+            )
+            # The reordering only pays off when the mesh is drawn indexed
+            renderer = self.opengl_widget.renderer
+            if renderer is not None and not renderer.draws_indexed:
+                info += " (not applied: fixed-function path draws de-indexed)"
+        mesh = self.opengl_widget.mesh
+        library = self.opengl_widget.model_library
+        info += (
+            f"\nMemory: {mesh.nbytes() / (1024 * 1024):.1f} MB RAM, {mesh.gpu_nbytes() / (1024 * 1024):.1f} MB GPU\n"
+            f"Library: {len(library)} models, "
+            f"{library.ram_bytes() / (1024 * 1024):.0f}/{library.ram_budget_bytes / (1024 * 1024):.0f} MB RAM, "
+            f"{library.gpu_bytes() / (1024 * 1024):.0f}/{library.gpu_budget_bytes / (1024 * 1024):.0f} MB GPU"
+        )
+        self._object_name = obj_name
+        self.object_info_label.setText(info)
+
+    def on_model_prefetched(self, filename, mesh):
+        # Keep the library totals in the info label current as neighbours arrive
+        if self._object_name is not None and not self.opengl_widget.mesh.loading:
+            self.show_object_info(self._object_name)
+
+    def update_library_budgets(self):
+        self.opengl_widget.model_library.set_budgets(
+            self.library_ram_input.value() * 1024 * 1024, self.library_gpu_input.value() * 1024 * 1024
+        )
+        if self._object_name is not None and not self.opengl_widget.mesh.loading:
+            self.show_object_info(self._object_name)
+
+    def on_mesh_load_progress(self, vertex_count, face_count, elapsed_ms):
+        if self._first_batch_ms is None:
+            self._first_batch_ms = elapsed_ms
+        self.object_info_label.setText(
+            f"Loading: {self._loading_name}\n"
+            f"Vertices: {vertex_count:,}\n"
+            f"Faces: {face_count:,}"
+        )
+
+    def on_mesh_load_finished(self, success, elapsed_ms, message):
+        first_batch = f", first batch after {self._first_batch_ms:.0f} ms" if self._first_batch_ms is not None else ""
+        if success:
+            self.show_object_info(self._loading_name)
+            self.status_bar.showMessage(f"Successfully loaded {self._loading_name} in {elapsed_ms:.0f} ms{first_batch}")
+        else:
+            self.status_bar.showMessage(f"Failed to load {self._loading_name}: {message}")
+
+    def export_rotated_obj(self):
+        if self.opengl_widget.rotated_mesh is None:
+            self.status_bar.showMessage("Please apply a rotation first")
+            return
+            
+        filters = ";;".join(f"{name} (*{ext})" for ext, name in EXPORT_FORMATS.items())
+        filename, selected_filter = QFileDialog.getSaveFileName(self, "Export Rotated Object", "", filters)
+        if not filename:
+            return
+            
+        # Fall back to the extension of the chosen filter when the name has none
+        import os
+        if not os.path.splitext(filename)[1]:
+            filename += selected_filter[selected_filter.index("*") + 1:-1]
             
-            if success:
-                # Update object info
-                import os
-                obj_name = os.path.basename(filename)
-                if self.opengl_widget.mesh:
-                    vertex_count = len(self.opengl_widget.mesh.vertices)
-                    face_count = len(self.opengl_widget.mesh.faces)
-                    self.object_info_label.setText(
-                        f"Loaded: {obj_name}\n"
-                        f"Vertices: {vertex_count:,}\n"
-                        f"Faces: {face_count:,}"
-                    )
-                    self.status_bar.showMessage(f"Successfully loaded {obj_name}")
-                else:
-                    self.object_info_label.setText("Failed to load object")
-                    self.status_bar.showMessage("Failed to load object")
-            else:
-                self.object_info_label.setText("Failed to load object")
-                self.status_bar.showMessage("Failed to load object")
+        try:
+            self.opengl_widget.rotated_mesh.export(filename)
+        except (OSError, ValueError) as e:
+            self.status_bar.showMessage(f"Export failed: {e}")
+            return
+        self.status_bar.showMessage(f"Exported rotated object to {os.path.basename(filename)}")
 
     def apply_rotation(self):
         if self.opengl_widget.mesh is None:
@@ -210,11 +485,165 @@ class MainWindow(QMainWindow):
                 return
                 
             self.opengl_widget.rotate_mesh(axis, angle)
-            self.status_bar.showMessage(f"Applied rotation: {angle:.1f}° around ({axis[0]:.2f}, {axis[1]:.2f}, {axis[2]:.2f})")
+            self.status_bar.showMessage(
+                f"Applied rotation: {angle:.1f}° around ({axis[0]:.2f}, {axis[1]:.2f}, {axis[2]:.2f}) | "
+                f"{self.opengl_widget.rotation_cache.stats_text()}"
+            )
             
         except ValueError:
             self.status_bar.showMessage("Invalid input values")
 
+    def on_live_preview_toggled(self):
+        if self.live_preview_checkbox.isChecked():
+            self.on_rotation_input_changed()
+        else:
+            self.opengl_widget.preview_worker.cancel()
+
+    def on_rotation_input_changed(self):
+        if not self.live_preview_checkbox.isChecked() or self.opengl_widget.mesh is None:
+            return
+            
+        axis = [
+            self.axis_x_input.value(),
+            self.axis_y_input.value(), 
+            self.axis_z_input.value()
+        ]
+        angle = self.angle_input.value()
+        
+        axis_magnitude = sum(x*x for x in axis) ** 0.5
+        if axis_magnitude < 0.001:
+            self.status_bar.showMessage("Invalid axis: cannot be zero vector")
+            return
+            
+        self.opengl_widget.request_preview_rotation(axis, angle)
+
+    def on_preview_frame_displayed(self, latency_ms):
+        worker = self.opengl_widget.preview_worker
+        stats = worker.latency_stats()
+        angle = self.opengl_widget.current_rotation_angle
+        # Frames served from the rotation cache or the point subset never went through the worker
+        computed = f", computed after {stats['compute']:.0f} ms" if stats['compute'] is not None else ""
+        self.status_bar.showMessage(
+            f"Live preview: {angle:.1f}° - latency {latency_ms:.0f} ms{computed} "
+            f"(avg {stats['mean']:.0f} ms, max {stats['max']:.0f} ms, "
+            f"{stats['over_bound']}/{stats['count']} over {worker.latency_bound_ms} ms) | "
+            f"{self.opengl_widget.rotation_cache.stats_text()}"
+        )
+
+    def update_point_cloud_mode(self):
+        enabled = self.point_cloud_checkbox.isChecked()
+        self.opengl_widget.set_point_cloud_mode(
+            enabled, self.point_budget_input.value(), self.point_size_input.value()
+        )
+        point_cloud = self.opengl_widget.point_cloud
+        if enabled and point_cloud is not None:
+            self.status_bar.showMessage(
+                f"Point cloud: {len(point_cloud):,} of {len(self.opengl_widget.mesh.vertices):,} vertices"
+            )
+
+    def update_comparison_grid(self):
+        if not self.show_grid_checkbox.isChecked():
+            self.opengl_widget.clear_comparison_grid()
+            return
+        if self.opengl_widget.mesh is None:
+            self.status_bar.showMessage("Please load an object first")
+            return
+            
+        count = self.grid_count_input.value()
+        if self.grid_mode_input.currentIndex() == 0:
+            # Evenly spaced angles around the current rotation axis, starting at 0°
+            axis = [
+                self.axis_x_input.value(),
+                self.axis_y_input.value(), 
+                self.axis_z_input.value()
+            ]
+            angles = np.linspace(0.0, 2 * np.pi, count, endpoint=False)
+            quaternions = axis_angle_to_quaternions(np.tile(axis, (count, 1)), angles)
+        else:
+            quaternions = random_quaternions(count)
+        self.opengl_widget.set_comparison_grid(quaternions)
+
+    def on_grid_frame_rendered(self, count, frame_ms):
+        self.status_bar.showMessage(f"Comparison grid: {count} rotations, {frame_ms:.1f} ms per frame")
+
+    def open_orientation_log(self):
+        filename, _ = QFileDialog.getOpenFileName(
+            self,
+            "Open Orientation Log",
+            "",
+            "Orientation Logs (*.csv *.txt *.qlog *.bin);;All Files (*)"
+        )
+        if not filename:
+            return
+            
+        self.status_bar.showMessage("Loading orientation log...")
+        try:
+            log = self.orientation_player.open_log(filename)
+        except (OSError, ValueError) as e:
+            self.status_bar.showMessage(f"Failed to open orientation log: {e}")
+            return
+            
+        import os
+        self.playback_info_label.setText(
+            f"Log: {os.path.basename(filename)}\n"
+            f"Samples: {len(log):,}\n"
+            f"Duration: {log.duration:.2f} s"
+        )
+        self.status_bar.showMessage(f"Opened orientation log with {len(log):,} samples")
+
+    def listen_orientation_stream(self):
+        port = self.port_input.value()
+        try:
+            self.orientation_player.listen(port)
+        except OSError as e:
+            self.status_bar.showMessage(f"Cannot listen on port {port}: {e}")
+            return
+        self.playback_info_label.setText(f"Listening on 127.0.0.1:{port}")
+        self.status_bar.showMessage(f"Waiting for orientation stream on port {port}")
+
+    def start_stdin_stream(self):
+        self.orientation_player.read_stdin()
+        self.playback_info_label.setText("Reading orientations from stdin")
+
+    def toggle_playback(self):
+        if self.orientation_player.is_playing:
+            self.orientation_player.pause()
+        else:
+            self.orientation_player.play()
+
+    def stop_playback(self):
+        self.orientation_player.stop()
+        self.seek_slider.setValue(0)
+        self.playback_info_label.setText("No orientation source")
+
+    def seek_playback(self, slider_value):
+        self.orientation_player.seek(self.orientation_player.duration * slider_value / 1000)
+
+    def on_playback_position_changed(self, position):
+        if self.orientation_player.log is not None:
+            duration = self.orientation_player.duration
+            if duration > 0 and not self.seek_slider.isSliderDown():
+                self.seek_slider.setValue(int(position / duration * 1000))
+            self.status_bar.showMessage(f"Playback: {position:.2f} / {duration:.2f} s")
+        else:
+            self.status_bar.showMessage(f"Live stream: {int(position):,} samples received")
+
+    def on_playback_state_changed(self, playing):
+        self.play_button.setText("Pause" if playing else "Play")
+
+    def show_memory_panel(self):
+        if self.memory_panel is None:
+            self.memory_panel = MemoryPanel(self.opengl_widget, parent=self)
+        self.memory_panel.show()
+        self.memory_panel.raise_()
+
+    def closeEvent(self, event):
+        # Don't keep the process alive reading the rest of a large file
+        self.opengl_widget.mesh_loader.shutdown()
+        self.opengl_widget.model_library.shutdown()
+        self.opengl_widget.preview_worker.shutdown()
+        super().closeEvent(event)
+
     def update_visualizations(self):
         self.opengl_widget.show_axes = self.show_axes_checkbox.isChecked()
         self.opengl_widget.show_rotation_axis = self.show_rotation_axis_checkbox.isChecked()
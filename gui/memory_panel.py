@@ -0,0 +1,66 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton, QCheckBox
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFontDatabase
+from graphics.memory_stats import footprint_table, format_bytes
+
+
+class MemoryPanel(QDialog):
+    # Debug view of what the loaded models cost: per-object footprints, cache and library
+    # totals, and the peak allocations of the last traced load and rotation
+
+    def __init__(self, opengl_widget, parent=None):
+        super().__init__(parent)
+        self.opengl_widget = opengl_widget
+        self.setWindowTitle("Memory Report")
+        self.resize(760, 420)
+        layout = QVBoxLayout(self)
+
+        self.report_view = QPlainTextEdit()
+        self.report_view.setReadOnly(True)
+        self.report_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        layout.addWidget(self.report_view)
+
+        buttons = QHBoxLayout()
+        self.trace_checkbox = QCheckBox("Trace allocations (slows loading)")
+        self.trace_checkbox.setChecked(opengl_widget.allocation_tracer.enabled)
+        self.trace_checkbox.stateChanged.connect(self.toggle_tracing)
+        buttons.addWidget(self.trace_checkbox)
+        buttons.addStretch()
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        buttons.addWidget(refresh_button)
+        layout.addLayout(buttons)
+
+        # Prefetches and evictions change the numbers without any input here
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def toggle_tracing(self):
+        self.opengl_widget.allocation_tracer.enabled = self.trace_checkbox.isChecked()
+        self.refresh()
+
+    def refresh(self):
+        widget = self.opengl_widget
+        rows, host_bytes, gpu_bytes = widget.memory_footprint()
+        text = footprint_table(rows)
+        text += f"\n\nTotal: {format_bytes(host_bytes)} RAM (shared arrays counted once), {format_bytes(gpu_bytes)} GPU\n"
+        text += f"{widget.rotation_cache.stats_text()}\n{widget.model_library.stats_text()}\n\n"
+
+        tracer = widget.allocation_tracer
+        if tracer.records:
+            text += "Peak allocations (tracemalloc):\n" + tracer.report()
+        elif tracer.enabled:
+            text += "Peak allocations: load a model or apply a rotation to record them"
+        else:
+            text += "Peak allocations: tracing is off"
+        self.report_view.setPlainText(text)
@@ -0,0 +1,229 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from graphics.mesh_object import MeshObject
+import os
+
+MODEL_EXTENSIONS = ('.obj',)
+
+
+def _key(filename, optimize=False, progressive=False):
+    return (os.path.abspath(filename), optimize, progressive)
+
+
+class ModelLibrary(QObject):
+    # Decoded meshes of the current directory, kept in an LRU pool within RAM and GPU budgets.
+    # Neighbours of the displayed model are loaded on background threads ahead of time.
+
+    # Emitted from prefetch threads (key, mesh or None, error message); Qt queues it onto the GUI thread
+    _prefetched = pyqtSignal(object, object, str)
+
+    # A load that found its model's prefetch already running finished: path, mesh (None if it
+    # failed) and error message. The mesh is pooled and current by then.
+    mesh_loaded = pyqtSignal(str, object, str)
+
+    # A prefetched mesh joined the pool (path, mesh); its draw buffer is staged for upload
+    mesh_prefetched = pyqtSignal(str, object)
+    # The mesh left the pool; its GPU buffers and cached rotations can go
+    mesh_evicted = pyqtSignal(object)
+    # Over the GPU budget: release this pooled mesh's buffers, it re-uploads if shown again
+    gpu_release_requested = pyqtSignal(object)
+
+    def __init__(self, ram_budget_bytes=1024 * 1024 * 1024, gpu_budget_bytes=512 * 1024 * 1024,
+                 prefetch_radius=1, parent=None):
+        super().__init__(parent)
+        self.ram_budget_bytes = ram_budget_bytes
+        self.gpu_budget_bytes = gpu_budget_bytes
+        self.prefetch_radius = prefetch_radius
+
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="model-prefetch")
+        self._prefetched.connect(self._store_prefetched)
+
+        # (absolute path, optimize, progressive) -> MeshObject, least recently used first. The
+        # progressive OBJ reader keeps the file's vertices as written while trimesh merges them,
+        # so a mesh from one loader never stands in for the other.
+        self._pool = OrderedDict()
+        self._pending = {}
+        # Key whose running prefetch a load is waiting for
+        self._awaited = None
+        self.files = []
+        # Key of the displayed model, never evicted
+        self.current = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def scan(self, filename):
+        directory = os.path.dirname(os.path.abspath(filename))
+        self.files = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(MODEL_EXTENSIONS)
+        )
+
+    def _index(self, path):
+        if path not in self.files:
+            self.scan(path)
+        return self.files.index(path) if path in self.files else None
+
+    def current_filename(self):
+        return self.current[0] if self.current is not None else None
+
+    def neighbour(self, filename, step):
+        # Next/previous model file in the directory, wrapping around
+        path = os.path.abspath(filename)
+        index = self._index(path)
+        if index is None:
+            return self.files[0] if self.files else None
+        return self.files[(index + step) % len(self.files)]
+
+    def __len__(self):
+        return len(self._pool)
+
+    def contains(self, filename, optimize=False, progressive=False):
+        return _key(filename, optimize, progressive) in self._pool
+
+    def meshes(self):
+        return list(self._pool.values())
+
+    def contains_mesh(self, mesh):
+        return any(pooled is mesh for pooled in self._pool.values())
+
+    def load(self, filename, optimize=False, progressive=False):
+        # The mesh, or None if its prefetch is already running: rather than wait for it here,
+        # mesh_loaded follows once it is done
+        key = _key(filename, optimize, progressive)
+        self._awaited = None
+        mesh = self._pool.get(key)
+        if mesh is not None:
+            self._pool.move_to_end(key)
+            self.hits += 1
+        elif progressive:
+            # Progressive reads only come in through put()
+            raise KeyError(f"{filename} has not been read progressively")
+        else:
+            self.misses += 1
+            future = self._pending.get(key)
+            if future is not None and not future.cancel():
+                self._awaited = key
+                return None
+            self._pending.pop(key, None)
+            mesh = MeshObject(key[0], optimize=optimize)
+            self._pool[key] = mesh
+
+        self._make_current(key)
+        return mesh
+
+    def cancel_load(self):
+        # Another model is shown instead; the awaited prefetch is pooled like any other
+        self._awaited = None
+
+    def put(self, filename, mesh):
+        # Adopt a progressively loaded mesh as the displayed model
+        key = _key(filename, progressive=True)
+        previous = self._pool.pop(key, None)
+        if previous is not None and previous is not mesh:
+            self.mesh_evicted.emit(previous)
+        self._pool[key] = mesh
+        self._make_current(key)
+
+    def _make_current(self, key):
+        self._awaited = None
+        self.current = key
+        self.enforce_budgets()
+        self.prefetch_neighbours(key[0], key[1])
+
+    def set_budgets(self, ram_budget_bytes, gpu_budget_bytes):
+        self.ram_budget_bytes = ram_budget_bytes
+        self.gpu_budget_bytes = gpu_budget_bytes
+        self.enforce_budgets()
+
+    def ram_bytes(self):
+        return sum(mesh.nbytes() for mesh in self._pool.values())
+
+    def gpu_bytes(self):
+        return sum(mesh.gpu_nbytes() for mesh in self._pool.values())
+
+    def enforce_budgets(self):
+        # RAM: drop the least recently used models entirely
+        ram = self.ram_bytes()
+        for key in list(self._pool):
+            if ram <= self.ram_budget_bytes:
+                break
+            if key == self.current:
+                continue
+            mesh = self._pool.pop(key)
+            ram -= mesh.nbytes()
+            self.evictions += 1
+            self.mesh_evicted.emit(mesh)
+
+        # GPU: keep the models but release the buffers of the least recently used ones
+        gpu = self.gpu_bytes()
+        for key, mesh in self._pool.items():
+            if gpu <= self.gpu_budget_bytes:
+                break
+            if key == self.current or mesh.gpu_nbytes() == 0:
+                continue
+            gpu -= mesh.gpu_nbytes()
+            self.gpu_release_requested.emit(mesh)
+
+    def prefetch_neighbours(self, filename, optimize=False):
+        path = os.path.abspath(filename)
+        index = self._index(path)
+        if index is None:
+            return
+        wanted = set()
+        for offset in range(1, self.prefetch_radius + 1):
+            wanted.add(self.files[(index + offset) % len(self.files)])
+            wanted.add(self.files[(index - offset) % len(self.files)])
+        wanted.discard(path)
+
+        # Prefetches that are no longer next to the displayed model are dropped if not started yet
+        for key in list(self._pending):
+            if key[0] not in wanted and self._pending[key].cancel():
+                del self._pending[key]
+        for neighbour in sorted(wanted):
+            key = _key(neighbour, optimize)
+            if key not in self._pool and key not in self._pending:
+                self._pending[key] = self._executor.submit(self._prefetch, key)
+
+    def shutdown(self):
+        for future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+        self._executor.shutdown(wait=False)
+
+    def stats_text(self):
+        return (
+            f"Library: {len(self._pool)} models, {self.hits} hits, {self.misses} misses, {self.evictions} evictions, "
+            f"RAM {self.ram_bytes() / (1024 * 1024):.1f}/{self.ram_budget_bytes / (1024 * 1024):.0f} MB, "
+            f"GPU {self.gpu_bytes() / (1024 * 1024):.1f}/{self.gpu_budget_bytes / (1024 * 1024):.0f} MB"
+        )
+
+    def _prefetch(self, key):
+        error = ""
+        try:
+            mesh = MeshObject(key[0], optimize=key[1])
+            mesh.stage()
+        except Exception as e:
+            # trimesh raises all sorts of errors for unreadable files; a prefetch just gives up
+            print(f"ModelLibrary: Prefetch of {key[0]} failed: {e}")
+            mesh = None
+            error = str(e)
+        self._prefetched.emit(key, mesh, error)
+        return mesh
+
+    def _store_prefetched(self, key, mesh, error):
+        self._pending.pop(key, None)
+        if key == self._awaited:
+            self._awaited = None
+            if mesh is not None:
+                self._pool[key] = mesh
+                self._make_current(key)
+            self.mesh_loaded.emit(key[0], mesh, error)
+            return
+        if mesh is None or key in self._pool or key[0] not in self.files:
+            return
+        self._pool[key] = mesh
+        self.enforce_budgets()
+        if key in self._pool:
+            self.mesh_prefetched.emit(key[0], mesh)
@@ -1,18 +1,42 @@
 from PyQt5.QtWidgets import QOpenGLWidget
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QMouseEvent
 from OpenGL.GL import *
-from OpenGL.GLU import *
 from graphics.mesh_object import MeshObject
+from graphics.overlay_batch import OverlayBatch
+from graphics.point_cloud import LoadingPointCloud, DEFAULT_POINT_BUDGET
+from graphics.renderer import create_renderer
+from graphics.rotation_cache import RotationCache
+from graphics.memory_stats import AllocationTracer, unique_nbytes
 from math3d.quaternion import Quaternion
 from math3d.vector3d import Vector3D
+from math3d.batch import quaternions_to_matrices
+from math3d.matrix import perspective, translation, rotation, scaling
+from gui.rotation_preview import RotationPreviewWorker
+from gui.progressive_loader import ProgressiveMeshLoader
+from gui.model_library import ModelLibrary
 import numpy as np
+import time
 
 class GLWidget(QOpenGLWidget):
+    # Latency in milliseconds from the live-preview input change to the painted frame
+    preview_frame_displayed = pyqtSignal(float)
+
+    # Grid mode: instance count and CPU time per frame in milliseconds
+    grid_frame_rendered = pyqtSignal(int, float)
+
+    # Progressive loading: vertices and faces received so far, milliseconds since the load started
+    mesh_load_progress = pyqtSignal(int, int, float)
+    # Progressive loading, or a load waiting for the model's prefetch, done: success, total
+    # milliseconds, error message
+    mesh_load_finished = pyqtSignal(bool, float, str)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.mesh = None
-        self.rotated_mesh = None
+        self._rotated_mesh = None
+        # Meshes replaced outside paintGL; their GPU buffers are freed once the context is current
+        self._retired_meshes = []
         
         # Camera controls
         self.camera_distance = 5.0
@@ -22,6 +46,7 @@ class GLWidget(QOpenGLWidget):
         
         # Object scaling
         self.scale_factor = 1.0
+        self.mesh_extent = None
         
         # Visualization settings
         self.show_axes = True
@@ -34,73 +59,340 @@ class GLWidget(QOpenGLWidget):
         self.current_rotation_axis = [1.0, 0.0, 0.0]
         self.current_rotation_angle = 45.0
 
+        # Comparison grid: one shared mesh buffer drawn under many per-instance rotations
+        self.grid_matrices = None
+
+        # Orientation driven by log/stream playback, as a 4x4 model matrix
+        self.playback_matrix = None
+
+        # Point-cloud mode: a stratified vertex subsample drawn as GL_POINTS instead of triangles
+        self.point_cloud_mode = False
+        self.point_budget = DEFAULT_POINT_BUDGET
+        self.point_size = 2.0
+        self.point_cloud = None
+        self.rotated_points = None
+        self._point_cloud_key = None
+
+        # Chosen in initializeGL: shader pipeline when available, fixed-function otherwise
+        self.renderer = None
+        self._overlay_batch = None
+        self._overlay_key = None
+
+        # Rotated vertex sets keyed by (mesh, quantized quaternion), LRU within a memory budget
+        self.rotation_cache = RotationCache()
+
+        # Live preview: debounced rotation on a worker thread
+        self.preview_worker = RotationPreviewWorker(parent=self)
+        self.preview_worker.result_ready.connect(self.apply_rotation_result)
+        self._preview_requested_at = None
+
+        # Progressive loading: batches parsed on a reader thread are appended to the mesh as they arrive
+        self.mesh_loader = ProgressiveMeshLoader(parent=self)
+        self.mesh_loader.batch_ready.connect(self.append_mesh_batch)
+        self.mesh_loader.load_finished.connect(self.finish_progressive_load)
+        self.mesh_loader.load_failed.connect(self.fail_progressive_load)
+        self.loading_points = None
+        self._loading_filename = None
+        self._load_generation = None
+        self._load_started_at = None
+        self._rotate_after_load = False
+
+        # Decoded meshes of the current directory, prefetched and kept within RAM/GPU budgets
+        self.model_library = ModelLibrary(parent=self)
+        self.model_library.mesh_prefetched.connect(self.on_mesh_prefetched)
+        self.model_library.mesh_loaded.connect(self.show_loaded_mesh)
+        self.model_library.mesh_evicted.connect(self.on_mesh_evicted)
+        self.model_library.gpu_release_requested.connect(self.release_mesh_gl)
+
+        # Peak allocations of load_mesh and rotate_mesh, for the memory report
+        self.allocation_tracer = AllocationTracer()
+
+    @property
+    def rotated_mesh(self):
+        return self._rotated_mesh
+
+    @rotated_mesh.setter
+    def rotated_mesh(self, mesh):
+        if self._rotated_mesh is not None and self._rotated_mesh is not mesh:
+            self._retired_meshes.append(self._rotated_mesh)
+        self._rotated_mesh = mesh
+        if self.point_cloud_mode:
+            # The full rotation supersedes any subset-only preview
+            self.set_rotated_points(self.rotated_point_cloud(mesh))
+
+    def rotated_point_cloud(self, rotated_mesh):
+        # Same vertex subset as the original's cloud, so the preview and the full rotation agree
+        if rotated_mesh is None:
+            return None
+        return rotated_mesh.point_cloud(sample=self.mesh.point_sample(self.point_budget))
+
+    def set_rotated_points(self, cloud):
+        if self.rotated_points is not None:
+            self._retired_meshes.append(self.rotated_points)
+        self.rotated_points = cloud
+
+    def release_retired_meshes(self):
+        for mesh in self._retired_meshes:
+            mesh.release_gl()
+        self._retired_meshes = []
+
+    def upload_mesh(self, mesh):
+        # Outside paintGL the widget's context has to be made current first; before the
+        # widget is shown there is none, and the upload happens on first draw instead
+        if self.isValid():
+            self.makeCurrent()
+            mesh.upload(indexed=self.renderer is not None and self.renderer.draws_indexed)
+            self.doneCurrent()
+
+    def release_mesh_gl(self, mesh):
+        if self.isValid():
+            self.makeCurrent()
+            mesh.release_gl()
+            self.doneCurrent()
+        else:
+            self._retired_meshes.append(mesh)
+
+    def on_mesh_prefetched(self, filename, mesh):
+        # Only up to the GPU budget; over it the buffers would be released again straight away
+        indexed = self.renderer is not None and self.renderer.draws_indexed
+        if self.model_library.gpu_bytes() + mesh.upload_nbytes(indexed) <= self.model_library.gpu_budget_bytes:
+            self.upload_mesh(mesh)
+
+    def on_mesh_evicted(self, mesh):
+        if mesh is self.mesh:
+            return
+        self.rotation_cache.discard_mesh(mesh)
+        self.release_mesh_gl(mesh)
+
+    def memory_footprint(self):
+        # (label, {category: bytes}) rows, plus host and GPU totals. Rows overlap (the rotated
+        # mesh shares faces with the original and its vertices are in the rotation cache),
+        # the host total counts shared arrays once.
+        buffers = [
+            (label, buffer) for label, buffer in (
+                ("Original", self.mesh), ("Rotated", self.rotated_mesh), ("Point cloud", self.point_cloud),
+                ("Rotated points", self.rotated_points), ("Loading points", self.loading_points),
+            ) if buffer is not None
+        ]
+        pooled = [mesh for mesh in self.model_library.meshes() if mesh is not self.mesh]
+        cached = self.rotation_cache.arrays()
+
+        rows = [(label, buffer.footprint()) for label, buffer in buffers]
+        rows.append(("Rotation cache", {'vertices': unique_nbytes(cached)}))
+        if pooled:
+            library = {}
+            for mesh in pooled:
+                for category, count in mesh.footprint().items():
+                    library[category] = library.get(category, 0) + count
+            rows.append((f"Library ({len(pooled)} more)", library))
+
+        owners = [buffer for _, buffer in buffers] + pooled
+        arrays = cached + [array for buffer in owners for group in buffer.host_arrays().values() for array in group]
+        return rows, unique_nbytes(arrays), sum(buffer.gpu_nbytes() for buffer in owners)
+
     def initializeGL(self):
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
-        glEnable(GL_LIGHT0)
-        glEnable(GL_COLOR_MATERIAL)
-        glColorMaterial(GL_FRONT_AND_BACK, GL_AMBIENT_AND_DIFFUSE)
-        
-        # Set up lighting
-        light_pos = [2.0, 2.0, 2.0, 1.0]
-        light_ambient = [0.3, 0.3, 0.3, 1.0]
-        light_diffuse = [0.8, 0.8, 0.8, 1.0]
-        light_specular = [1.0, 1.0, 1.0, 1.0]
-        
-        glLightfv(GL_LIGHT0, GL_POSITION, light_pos)
-        glLightfv(GL_LIGHT0, GL_AMBIENT, light_ambient)
-        glLightfv(GL_LIGHT0, GL_DIFFUSE, light_diffuse)
-        glLightfv(GL_LIGHT0, GL_SPECULAR, light_specular)
-        
         glClearColor(0.1, 0.1, 0.1, 1)
+        self.renderer = create_renderer()
+        print(f"GLWidget: Using {self.renderer.name} renderer")
 
     def resizeGL(self, w, h):
         glViewport(0, 0, w, h)
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        gluPerspective(45, w / h if h != 0 else 1, 0.1, 100)
+
+    def framebuffer_size(self):
+        ratio = self.devicePixelRatioF()
+        return int(self.width() * ratio), int(self.height() * ratio)
+
+    def projection_matrix(self, width, height):
+        return perspective(45, width / height if height != 0 else 1, 0.1, 100)
+
+    def view_matrix(self):
+        # Camera position based on mouse interaction, then the object scale
+        return (
+            translation(0, 0, -self.camera_distance)
+            @ rotation(self.camera_rotation_x, 1, 0, 0)
+            @ rotation(self.camera_rotation_y, 0, 1, 0)
+            @ scaling(self.scale_factor)
+        )
 
     def paintGL(self):
+        self.release_retired_meshes()
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        
-        # Set up camera position based on mouse interaction
-        glTranslatef(0, 0, -self.camera_distance)
-        glRotatef(self.camera_rotation_x, 1, 0, 0)
-        glRotatef(self.camera_rotation_y, 0, 1, 0)
-        
-        # Scale the object
-        glScalef(self.scale_factor, self.scale_factor, self.scale_factor)
 
-        # Draw visualizations
-        if self.show_axes:
-            self.draw_coordinate_axes()
-        
-        if self.show_rotation_axis:
-            self.draw_rotation_axis()
+        if self.grid_matrices is not None and self.mesh:
+            self.paint_comparison_grid()
+            return
 
-        # Draw objects
-        if self.mesh and self.show_original_object:
-            glColor3f(0.8, 0.8, 0.9)  # Light blue: original mesh
-            self.mesh.draw()
+        width, height = self.framebuffer_size()
+        self.renderer.begin_frame(self.projection_matrix(width, height), self.view_matrix())
+
+        if self.point_cloud_mode and self.point_cloud is not None:
+            self.paint_point_clouds()
+        else:
+            self.paint_meshes()
             
-        if self.rotated_mesh and self.show_rotated_object:
-            glColor3f(1.0, 0.3, 0.8)  # Magenta: rotated mesh
-            self.rotated_mesh.draw()
+        # Draw visualizations last; the batch puts depth-tested lines before the on-top angle labels
+        self.renderer.draw_overlays(self.overlay_batch())
+        self.renderer.end_frame()
+
+        if self._preview_requested_at is not None:
+            latency_ms = (time.perf_counter() - self._preview_requested_at) * 1000
+            self._preview_requested_at = None
+            self.preview_worker.record_latency(latency_ms)
+            self.preview_frame_displayed.emit(latency_ms)
+
+    def paint_meshes(self):
+        if self.mesh and self.show_original_object:
+            self.renderer.draw_mesh(self.mesh, (0.8, 0.8, 0.9))  # Light blue: original mesh
+
+        if self.loading_points is not None and self.show_original_object:
+            # Vertices read ahead of their faces, so the model shows up before the first triangles
+            self.renderer.set_point_size(self.point_size)
+            self.renderer.draw_mesh(self.loading_points, (0.8, 0.8, 0.9))
             
-        # Draw angle labels last (on top)
-        if self.show_angle_label:
-            self.draw_angle_labels()
+        if self.playback_matrix is not None and self.mesh and self.show_rotated_object:
+            # Playback rotates on the GPU via the model matrix, no per-frame vertex work
+            self.renderer.draw_mesh(self.mesh, (1.0, 0.3, 0.8), self.playback_matrix)  # Magenta: rotated mesh
+        elif self.rotated_mesh and self.show_rotated_object:
+            self.renderer.draw_mesh(self.rotated_mesh, (1.0, 0.3, 0.8))  # Magenta: rotated mesh
+
+    def paint_point_clouds(self):
+        self.renderer.set_point_size(self.point_size)
+        if self.show_original_object:
+            self.renderer.draw_mesh(self.point_cloud, (0.8, 0.8, 0.9))
+
+        if self.playback_matrix is not None and self.show_rotated_object:
+            self.renderer.draw_mesh(self.point_cloud, (1.0, 0.3, 0.8), self.playback_matrix)
+        elif self.rotated_points is not None and self.show_rotated_object:
+            self.renderer.draw_mesh(self.rotated_points, (1.0, 0.3, 0.8))
+
+    def overlay_batch(self):
+        # Overlay geometry only depends on these, so it is rebuilt (and re-uploaded) only when they change
+        key = (
+            self.show_axes, self.show_rotation_axis, self.show_angle_label,
+            tuple(self.current_rotation_axis), self.current_rotation_angle,
+            self.scale_factor, self.mesh_extent,
+        )
+        if key != self._overlay_key:
+            batch = OverlayBatch()
+            if self.show_axes:
+                self.draw_coordinate_axes(batch)
+            if self.show_rotation_axis:
+                self.draw_rotation_axis(batch)
+            if self.show_angle_label:
+                self.draw_angle_labels(batch)
+            self._overlay_batch = batch.finish()
+            self._overlay_key = key
+        return self._overlay_batch
+
+    def grid_shape(self, count):
+        columns = int(np.ceil(np.sqrt(count)))
+        rows = int(np.ceil(count / columns))
+        return columns, rows
+
+    def paint_comparison_grid(self):
+        start = time.perf_counter()
+        width, height = self.framebuffer_size()
+        count = len(self.grid_matrices)
+        columns, rows = self.grid_shape(count)
+        cell_width = width // columns
+        cell_height = height // rows
+        viewports = [
+            (column * cell_width, height - (row + 1) * cell_height, cell_width, cell_height)
+            for row, column in (divmod(i, columns) for i in range(count))
+        ]
+
+        # All cells share one projection and camera; only viewport and model matrix change per instance
+        self.renderer.begin_frame(self.projection_matrix(cell_width, cell_height), self.view_matrix())
+        geometry = self.mesh
+        if self.point_cloud_mode and self.point_cloud is not None:
+            self.renderer.set_point_size(self.point_size)
+            geometry = self.point_cloud
+        self.renderer.draw_mesh_instances(geometry, (1.0, 0.3, 0.8), self.grid_matrices, viewports)  # Magenta
+        self.renderer.end_frame()
+
+        # Restore the full-window viewport for the normal view
+        glViewport(0, 0, width, height)
+        self.grid_frame_rendered.emit(count, (time.perf_counter() - start) * 1000)
+
+    def set_comparison_grid(self, quaternions):
+        matrices = np.zeros((len(quaternions), 4, 4))
+        matrices[:, :3, :3] = quaternions_to_matrices(quaternions)
+        matrices[:, 3, 3] = 1.0
+        self.grid_matrices = matrices
+        self.update()
 
-    def load_mesh(self, filename):
+    def clear_comparison_grid(self):
+        self.grid_matrices = None
+        self.update()
+
+    def set_point_cloud_mode(self, enabled, budget=None, size=None):
+        if budget is not None:
+            self.point_budget = budget
+        if size is not None:
+            self.point_size = size
+        self.point_cloud_mode = enabled
+        self.update_point_clouds()
+        self.update()
+
+    def update_point_clouds(self):
+        if not self.point_cloud_mode or self.mesh is None or self.mesh.loading:
+            # A mesh that is still loading is sampled once its last batch is in
+            self.set_point_clouds(None, None)
+            self._point_cloud_key = None
+            return
+        if self._point_cloud_key == (self.mesh, self.point_budget):
+            return
+        self._point_cloud_key = (self.mesh, self.point_budget)
+
+        point_cloud = self.mesh.point_cloud(self.point_budget)
+        rotated_points = None
+        if self.rotated_mesh is not None:
+            rotated_points = self.rotated_point_cloud(self.rotated_mesh)
+        elif self.rotated_points is not None:
+            # A full rotation is still being computed; keep previewing it on the new subset
+            q = Quaternion.from_axis_angle(self.current_rotation_axis, self.current_rotation_angle)
+            rotated_points = point_cloud.rotated(q)
+        self.set_point_clouds(point_cloud, rotated_points)
+
+    def set_point_clouds(self, point_cloud, rotated_points):
+        if self.point_cloud is not None:
+            self._retired_meshes.append(self.point_cloud)
+        self.point_cloud = point_cloud
+        self.set_rotated_points(rotated_points)
+
+    def replace_mesh(self, mesh):
+        self.preview_worker.cancel()
+        self.mesh_loader.cancel()
+        self.model_library.cancel_load()
+        self._load_generation = None
+        self._rotate_after_load = False
+        # Pooled meshes keep their buffers and cached rotations for when they are shown again
+        if self.mesh is not None and self.mesh is not mesh and not self.model_library.contains_mesh(self.mesh):
+            self.rotation_cache.discard_mesh(self.mesh)
+            self._retired_meshes.append(self.mesh)
+        self.mesh = mesh
+        self.rotated_mesh = None
+        self.set_loading_points(None)
+        self.update_point_clouds()
+        self.auto_scale_object()
+
+    def set_loading_points(self, cloud):
+        if self.loading_points is not None:
+            self._retired_meshes.append(self.loading_points)
+        self.loading_points = cloud
+
+    def load_mesh(self, filename, optimize=False, progressive=False):
+        # None if the model's prefetch is still running; show_loaded_mesh takes over from there
         print(f"GLWidget: Loading mesh from {filename}")
         try:
-            self.mesh = MeshObject(filename)
-            self.rotated_mesh = None
-            
-            self.auto_scale_object()
-            
+            with self.allocation_tracer.trace("load_mesh"):
+                mesh = self.model_library.load(filename, optimize=optimize, progressive=progressive)
+                if mesh is None:
+                    print(f"GLWidget: Waiting for the background load of {filename}")
+                    self._load_started_at = time.perf_counter()
+                    return None
+                self.replace_mesh(mesh)
+                self.upload_mesh(self.mesh)
             print(f"GLWidget: Mesh loaded successfully with {len(self.mesh.vertices)} vertices")
             self.update()
             return True
@@ -110,19 +402,85 @@ class GLWidget(QOpenGLWidget):
             traceback.print_exc()
             return False
 
+    def show_loaded_mesh(self, filename, mesh, message):
+        elapsed_ms = (time.perf_counter() - self._load_started_at) * 1000
+        if mesh is None:
+            print(f"GLWidget: Error loading mesh: {message}")
+            self.mesh_load_finished.emit(False, elapsed_ms, message)
+            return
+        self.replace_mesh(mesh)
+        self.upload_mesh(self.mesh)
+        print(f"GLWidget: Mesh loaded successfully with {len(self.mesh.vertices)} vertices in {elapsed_ms:.0f} ms")
+        self.mesh_load_finished.emit(True, elapsed_ms, "")
+        self.update()
+
+    def load_mesh_progressive(self, filename):
+        # Returns immediately; the mesh fills in as append_mesh_batch receives batches
+        print(f"GLWidget: Loading mesh progressively from {filename}")
+        self.replace_mesh(MeshObject.progressive())
+        self._loading_filename = filename
+        self.set_loading_points(LoadingPointCloud(self.point_budget))
+        self._load_started_at = time.perf_counter()
+        self._load_generation = self.mesh_loader.load(filename)
+        self.update()
+
+    def append_mesh_batch(self, batch):
+        if batch.generation != self._load_generation:
+            return
+        self.mesh.append(batch.vertices, batch.faces)
+        if len(batch.vertices):
+            self.loading_points.extend(batch.vertices)
+        self.auto_scale_object()
+
+        elapsed_ms = (time.perf_counter() - self._load_started_at) * 1000
+        self.mesh_load_progress.emit(len(self.mesh.vertices), len(self.mesh.faces), elapsed_ms)
+        self.update()
+
+    def finish_progressive_load(self, generation):
+        if generation != self._load_generation:
+            return
+        self._load_generation = None
+        self.mesh.finish_loading()
+        self.set_loading_points(None)
+        self.update_point_clouds()
+        self.model_library.put(self._loading_filename, self.mesh)
+
+        elapsed_ms = (time.perf_counter() - self._load_started_at) * 1000
+        print(f"GLWidget: Mesh loaded successfully with {len(self.mesh.vertices)} vertices in {elapsed_ms:.0f} ms")
+        if self._rotate_after_load:
+            self._rotate_after_load = False
+            self.rotate_mesh(self.current_rotation_axis, self.current_rotation_angle)
+        self.mesh_load_finished.emit(True, elapsed_ms, "")
+        self.update()
+
+    def fail_progressive_load(self, generation, message):
+        if generation != self._load_generation:
+            return
+        # Keep whatever was read before the error
+        self._load_generation = None
+        self._rotate_after_load = False
+        self.mesh.finish_loading()
+        self.set_loading_points(None)
+        self.update_point_clouds()
+
+        elapsed_ms = (time.perf_counter() - self._load_started_at) * 1000
+        print(f"GLWidget: Error loading mesh: {message}")
+        self.mesh_load_finished.emit(False, elapsed_ms, message)
+        self.update()
+
     def auto_scale_object(self):
+        self.mesh_extent = None
         if self.mesh is None:
             return
             
-        vertices = np.array(self.mesh.vertices)
-        if len(vertices) == 0:
+        # Bounding box; while loading progressively it grows with each batch until it settles
+        bounds = self.mesh.bounds()
+        if bounds is None:
             return
-            
-        # Calculate bounding box
-        min_coords = np.min(vertices, axis=0)
-        max_coords = np.max(vertices, axis=0)
+        min_coords, max_coords = bounds
         size = max_coords - min_coords
         max_size = np.max(size)
+        self.mesh_extent = max_size
         
         # Scale to fit roughly in a 2x2x2 box
         if max_size > 0:
@@ -134,25 +492,80 @@ class GLWidget(QOpenGLWidget):
         if self.mesh is None:
             return
 
+        self.preview_worker.cancel()
         self.current_rotation_axis = axis_input.copy()
         self.current_rotation_angle = angle_deg
+        if self.mesh.loading:
+            # A rotation of the partial mesh would be outdated by the next batch; apply it once loaded
+            self._rotate_after_load = True
+            self.update()
+            return
 
-        axis = Vector3D(*axis_input).normalize()
-        angle_rad = angle_deg * 3.14159265 / 180
+        with self.allocation_tracer.trace("rotate_mesh"):
+            q = Quaternion.from_axis_angle(axis_input, angle_deg)
+            new_vertices = self.rotation_cache.get(self.mesh, q)
+            if new_vertices is None and self.point_cloud_mode and self.point_cloud is not None:
+                # Show the rotated subset right away; the full mesh follows from the worker
+                self.set_rotated_points(self.point_cloud.rotated(q))
+                self.preview_worker.request(self.mesh, axis_input, angle_deg, immediate=True)
+                self.update()
+                return
+            if new_vertices is None:
+                new_vertices = q.rotate_vertices(self.mesh.vertices)
+                self.rotation_cache.put(self.mesh, q, new_vertices)
 
-        from math import cos, sin
-        w = cos(angle_rad / 2)
-        vector_part = axis.normalize().mult(sin(angle_rad / 2))
-        q = Quaternion(w, vector_part)
+            self.rotated_mesh = self.mesh.create_copy_with_new_vertices(new_vertices)
+        self.update()
 
-        # Rotate each vertex manually
-        new_vertices = []
-        for v in self.mesh.vertices:
-            v_vec = Vector3D(*v)
-            rotated_v = q.rotate(v_vec)
-            new_vertices.append([rotated_v.x, rotated_v.y, rotated_v.z])
+    def request_preview_rotation(self, axis_input, angle_deg):
+        if self.mesh is None:
+            return
+        self.set_rotation_params(axis_input, angle_deg)
+        if self.mesh.loading:
+            self._rotate_after_load = True
+            self.update()
+            return
+
+        q = Quaternion.from_axis_angle(axis_input, angle_deg)
+        cached_vertices = self.rotation_cache.get(self.mesh, q)
+        if cached_vertices is not None:
+            # Served from cache: no need to go through the worker at all
+            self.preview_worker.cancel()
+            self.rotated_mesh = self.mesh.create_copy_with_new_vertices(cached_vertices)
+            self._preview_requested_at = time.perf_counter()
+        else:
+            if self.point_cloud_mode and self.point_cloud is not None:
+                # Rotating only the sampled points is cheap enough to do on every input change
+                self.set_rotated_points(self.point_cloud.rotated(q))
+                self._preview_requested_at = time.perf_counter()
+            self.preview_worker.request(self.mesh, axis_input, angle_deg)
+        self.update()
+
+    def apply_rotation_result(self, result):
+        # Drop results that were superseded or belong to a previously loaded mesh
+        if not self.preview_worker.is_current(result) or result.mesh is not self.mesh:
+            return
+
+        self.preview_worker.record_result(result)
+        self.rotation_cache.put(self.mesh, Quaternion.from_axis_angle(result.axis, result.angle), result.vertices)
+
+        # Single reference assignment, so paintGL never sees a half-built mesh
+        self.rotated_mesh = self.mesh.create_copy_with_new_vertices(result.vertices)
+        self._preview_requested_at = result.requested_at
+        self.update()
+
+    def set_playback_orientation(self, quaternion):
+        w, x, y, z = quaternion
+        matrix = np.identity(4)
+        matrix[:3, :3] = quaternions_to_matrices(quaternion)[0]
+        self.playback_matrix = matrix
+
+        axis, angle = Quaternion(w, Vector3D(x, y, z)).to_axis_angle()
+        self.set_rotation_params(axis, angle)
+        self.update()
 
-        self.rotated_mesh = self.mesh.create_copy_with_new_vertices(new_vertices)
+    def clear_playback_orientation(self):
+        self.playback_matrix = None
         self.update()
 
     def mousePressEvent(self, event: QMouseEvent):
@@ -189,7 +602,9 @@ class GLWidget(QOpenGLWidget):
         self.update()
 
     def reset_view(self):
+        self.preview_worker.cancel()
         self.rotated_mesh = None
+        self.set_rotated_points(None)
         self.camera_distance = 5.0
         self.camera_rotation_x = 0.0
         self.camera_rotation_y = 0.0
@@ -202,85 +617,49 @@ class GLWidget(QOpenGLWidget):
         self.current_rotation_axis = axis.copy()
         self.current_rotation_angle = angle
 
-    def draw_coordinate_axes(self):
-        glDisable(GL_LIGHTING)  # Disable lighting for axes
-        glLineWidth(5.0)  # Thicker lines
-        
+    def draw_coordinate_axes(self, batch):
         # Calculate appropriate axis length based on object size
         axis_length = 2.5
-        if self.mesh is not None:
-            vertices = np.array(self.mesh.vertices)
-            if len(vertices) > 0:
-                size = np.max(vertices, axis=0) - np.min(vertices, axis=0)
-                max_size = np.max(size) * self.scale_factor
-                axis_length = max(2.5, max_size * 1.5)  # Make axes longer than object
-        
-        glBegin(GL_LINES)
-        
-        # X axis - Red
-        glColor3f(1, 0, 0)
-        glVertex3f(0, 0, 0)
-        glVertex3f(axis_length, 0, 0)
-        
-        # Y axis - Green  
-        glColor3f(0, 1, 0)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, axis_length, 0)
-        
-        # Z axis - Blue
-        glColor3f(0, 0, 1)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, 0, axis_length)
+        if self.mesh_extent is not None:
+            max_size = self.mesh_extent * self.scale_factor
+            axis_length = max(2.5, max_size * 1.5)  # Make axes longer than object
         
-        glEnd()
+        # X axis - Red, Y axis - Green, Z axis - Blue (thicker lines)
+        batch.lines([(0, 0, 0), (axis_length, 0, 0)], (1, 0, 0), 5.0)
+        batch.lines([(0, 0, 0), (0, axis_length, 0)], (0, 1, 0), 5.0)
+        batch.lines([(0, 0, 0), (0, 0, axis_length)], (0, 0, 1), 5.0)
         
         # Draw axis labels using simple geometry
-        self.draw_axis_labels(axis_length)
-        
-        glLineWidth(1.0)
-        glEnable(GL_LIGHTING)  # Re-enable lighting
+        self.draw_axis_labels(batch, axis_length)
 
-    def draw_axis_labels(self, axis_length):
-        glColor3f(1, 1, 1)  # White color for labels
-        glLineWidth(3.0)  # Thicker lines for labels
+    def draw_axis_labels(self, batch, axis_length):
+        white = (1, 1, 1)  # White color for labels
+        width = 3.0  # Thicker lines for labels
         
         label_offset = axis_length * 0.1  # Scale with axis length
         label_pos = axis_length + label_offset
         
         # X label (simple cross pattern)
-        glBegin(GL_LINES)
-        glVertex3f(label_pos - label_offset, -label_offset, 0)
-        glVertex3f(label_pos + label_offset, label_offset, 0)
-        glVertex3f(label_pos - label_offset, label_offset, 0)
-        glVertex3f(label_pos + label_offset, -label_offset, 0)
-        glEnd()
+        batch.lines([
+            (label_pos - label_offset, -label_offset, 0), (label_pos + label_offset, label_offset, 0),
+            (label_pos - label_offset, label_offset, 0), (label_pos + label_offset, -label_offset, 0),
+        ], white, width)
         
         # Y label (Y shape)
-        glBegin(GL_LINES)
-        glVertex3f(-label_offset, label_pos - label_offset, 0)
-        glVertex3f(0, label_pos, 0)
-        glVertex3f(label_offset, label_pos - label_offset, 0)
-        glVertex3f(0, label_pos, 0)
-        glVertex3f(0, label_pos, 0)
-        glVertex3f(0, label_pos + label_offset, 0)
-        glEnd()
+        batch.lines([
+            (-label_offset, label_pos - label_offset, 0), (0, label_pos, 0),
+            (label_offset, label_pos - label_offset, 0), (0, label_pos, 0),
+            (0, label_pos, 0), (0, label_pos + label_offset, 0),
+        ], white, width)
         
         # Z label (Z shape)
-        glBegin(GL_LINES)
-        glVertex3f(-label_offset, 0, label_pos - label_offset)
-        glVertex3f(label_offset, 0, label_pos - label_offset)
-        glVertex3f(label_offset, 0, label_pos - label_offset)
-        glVertex3f(-label_offset, 0, label_pos + label_offset)
-        glVertex3f(-label_offset, 0, label_pos + label_offset)
-        glVertex3f(label_offset, 0, label_pos + label_offset)
-        glEnd()
-        
-        glLineWidth(1.0)
-
-    def draw_rotation_axis(self):
-        if not hasattr(self, 'current_rotation_axis'):
-            return
-            
+        batch.lines([
+            (-label_offset, 0, label_pos - label_offset), (label_offset, 0, label_pos - label_offset),
+            (label_offset, 0, label_pos - label_offset), (-label_offset, 0, label_pos + label_offset),
+            (-label_offset, 0, label_pos + label_offset), (label_offset, 0, label_pos + label_offset),
+        ], white, width)
+
+    def draw_rotation_axis(self, batch):
         # Normalize the axis
         axis = np.array(self.current_rotation_axis)
         axis_length = np.linalg.norm(axis)
@@ -289,35 +668,20 @@ class GLWidget(QOpenGLWidget):
             
         axis = axis / axis_length
         
-        glDisable(GL_LIGHTING)
-        glLineWidth(6.0) 
-        
         # Calculate appropriate scale based on object size
         scale = 3.0
-        if self.mesh is not None:
-            vertices = np.array(self.mesh.vertices)
-            if len(vertices) > 0:
-                size = np.max(vertices, axis=0) - np.min(vertices, axis=0)
-                max_size = np.max(size) * self.scale_factor
-                scale = max(3.0, max_size * 2.0)  # Make axis longer than object
-        
-        # Draw rotation axis as a bright yellow/orange line
-        glColor3f(1.0, 0.8, 0.0)  # Yellow-orange
-        glBegin(GL_LINES)
+        if self.mesh_extent is not None:
+            max_size = self.mesh_extent * self.scale_factor
+            scale = max(3.0, max_size * 2.0)  # Make axis longer than object
         
-        # Draw line through origin in both directions
-        glVertex3f(-axis[0] * scale, -axis[1] * scale, -axis[2] * scale)
-        glVertex3f(axis[0] * scale, axis[1] * scale, axis[2] * scale)
-        
-        glEnd()
+        # Draw rotation axis as a bright yellow/orange line through origin in both directions
+        color = (1.0, 0.8, 0.0)  # Yellow-orange
+        batch.lines([tuple(-axis * scale), tuple(axis * scale)], color, 6.0)
         
         # Draw arrow heads to show direction
-        self.draw_arrow_heads(axis * scale)
-        
-        glLineWidth(1.0)
-        glEnable(GL_LIGHTING)
+        self.draw_arrow_heads(batch, axis * scale, color, 6.0)
 
-    def draw_arrow_heads(self, end_point):
+    def draw_arrow_heads(self, batch, end_point, color, width):
         arrow_size = 0.2
         
         # Calculate perpendicular vectors for arrow head
@@ -334,44 +698,33 @@ class GLWidget(QOpenGLWidget):
         perp1 = perp1 / np.linalg.norm(perp1)
         perp2 = np.cross(axis, perp1)
         
-        glBegin(GL_LINES)
-        
         # Arrow head lines
+        segments = []
         for angle in [0, 90, 180, 270]:
             rad = np.radians(angle)
             offset = arrow_size * (perp1 * np.cos(rad) + perp2 * np.sin(rad))
             
             arrow_point = end_point - 0.3 * axis + offset
-            glVertex3f(end_point[0], end_point[1], end_point[2])
-            glVertex3f(arrow_point[0], arrow_point[1], arrow_point[2])
-        
-        glEnd()
+            segments.extend([tuple(end_point), tuple(arrow_point)])
+        batch.lines(segments, color, width)
 
-    def draw_angle_labels(self):
-        if not hasattr(self, 'current_rotation_angle') or not self.show_rotation_axis:
+    def draw_angle_labels(self, batch):
+        if not self.show_rotation_axis:
             return
             
-        glDisable(GL_LIGHTING)
-        glDisable(GL_DEPTH_TEST)  # Draw on top of everything
-        
         # Get axis
         axis = np.array(self.current_rotation_axis)
         axis_length = np.linalg.norm(axis)
         if axis_length < 0.001:
-            glEnable(GL_DEPTH_TEST)
-            glEnable(GL_LIGHTING)
             return
             
         axis = axis / axis_length
         
         # Calculate appropriate scale and position
         scale = 1.5
-        if self.mesh is not None:
-            vertices = np.array(self.mesh.vertices)
-            if len(vertices) > 0:
-                size = np.max(vertices, axis=0) - np.min(vertices, axis=0)
-                max_size = np.max(size) * self.scale_factor
-                scale = max(1.5, max_size * 0.8)
+        if self.mesh_extent is not None:
+            max_size = self.mesh_extent * self.scale_factor
+            scale = max(1.5, max_size * 0.8)
         
         # Find position for angle display (offset from axis)
         if abs(axis[0]) < 0.9:
@@ -388,87 +741,54 @@ class GLWidget(QOpenGLWidget):
         # Position the angle display 
         center_pos = axis * scale * 0.5  
         
-        # Draw circular arc to show angle
-        glColor3f(1.0, 1.0, 0.0)  
-        glLineWidth(6.0) 
+        # Draw circular arc to show angle, on top of everything
+        yellow = (1.0, 1.0, 0.0)
         
         import math
         angle_rad = math.radians(abs(self.current_rotation_angle))
         num_segments = max(12, int(abs(self.current_rotation_angle) / 5)) 
         radius = scale * 0.4  
         
-        glBegin(GL_LINE_STRIP)
+        arc = []
         for i in range(num_segments + 1):
             theta = angle_rad * (i / num_segments)
             if self.current_rotation_angle < 0:
                 theta = -theta
             
             offset = radius * (perp * math.cos(theta) + perp2 * math.sin(theta))
-            pos = center_pos + offset
-            glVertex3f(pos[0], pos[1], pos[2])
-        glEnd()
+            arc.append(tuple(center_pos + offset))
+        batch.line_strip(arc, yellow, 6.0, on_top=True)
         
         text_pos = center_pos + perp * radius * 1.8 
-        self.draw_angle_number(text_pos, self.current_rotation_angle)
-        
-        glPointSize(12.0) 
-        glBegin(GL_POINTS)
+        self.draw_angle_number(batch, text_pos, self.current_rotation_angle)
         
-        # Start point
+        # Start and end points
         start_pos = center_pos + perp * radius
-        glVertex3f(start_pos[0], start_pos[1], start_pos[2])
-        
-        # End point
         end_theta = angle_rad if self.current_rotation_angle >= 0 else -angle_rad
         end_offset = radius * (perp * math.cos(end_theta) + perp2 * math.sin(end_theta))
         end_pos = center_pos + end_offset
-        glVertex3f(end_pos[0], end_pos[1], end_pos[2])
-        
-        glEnd()
-        glPointSize(1.0)
-        
-        glLineWidth(1.0)
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
+        batch.points([tuple(start_pos), tuple(end_pos)], yellow, 12.0, on_top=True)
 
-    def draw_angle_number(self, pos, angle):
-        glColor3f(1.0, 1.0, 1.0)  
-        glLineWidth(4.0) 
-        
-        glPointSize(40.0)  
-        glColor3f(0.0, 0.0, 0.0)  # Black background
-        glBegin(GL_POINTS)
-        glVertex3f(pos[0], pos[1], pos[2])
-        glEnd()
+    def draw_angle_number(self, batch, pos, angle):
+        # Black background with a dark gray disc, layered under the digits
+        batch.points([tuple(pos)], (0.0, 0.0, 0.0), 40.0, on_top=True, layer=1)
+        batch.points([tuple(pos)], (0.2, 0.2, 0.2), 35.0, on_top=True, layer=1)
         
-        glPointSize(35.0)
-        glColor3f(0.2, 0.2, 0.2)  # Dark gray
-        glBegin(GL_POINTS)
-        glVertex3f(pos[0], pos[1], pos[2])
-        glEnd()
-        
-        # Draw angle value with bright yellow color
-        glColor3f(1.0, 1.0, 0.0) 
-        
-        # Convert angle to string and draw representation
+        # Convert angle to string and draw representation with bright yellow color
         angle_str = f"{int(abs(angle))}"
-        self.draw_simple_text(pos, angle_str)
+        self.draw_simple_text(batch, pos, angle_str)
         
         degree_pos = pos + np.array([len(angle_str) * 0.08, 0.05, 0])
-        self.draw_degree_symbol(degree_pos)
-        
-        glPointSize(1.0)
-        glLineWidth(1.0)
+        self.draw_degree_symbol(batch, degree_pos)
 
-    def draw_simple_text(self, pos, text):
-        glLineWidth(4.0)  
+    def draw_simple_text(self, batch, pos, text):
         char_width = 0.12  
         
         for i, char in enumerate(text):
             char_pos = pos + np.array([i * char_width - (len(text)-1) * char_width * 0.5, 0, 0])  # Center the text
-            self.draw_simple_digit(char_pos, char)
+            self.draw_simple_digit(batch, char_pos, char)
 
-    def draw_simple_digit(self, pos, digit):
+    def draw_simple_digit(self, batch, pos, digit):
         if not digit.isdigit():
             return
             
@@ -493,53 +813,32 @@ class GLWidget(QOpenGLWidget):
             return
             
         pattern = segments[d]
-        
-        glBegin(GL_LINES)
-        
-        # Top
-        if pattern[0]:
-            glVertex3f(pos[0] - size, pos[1] + size, pos[2])
-            glVertex3f(pos[0] + size, pos[1] + size, pos[2])
-            
-        # Top-right
-        if pattern[1]:
-            glVertex3f(pos[0] + size, pos[1] + size, pos[2])
-            glVertex3f(pos[0] + size, pos[1], pos[2])
-            
-        # Bottom-right
-        if pattern[2]:
-            glVertex3f(pos[0] + size, pos[1], pos[2])
-            glVertex3f(pos[0] + size, pos[1] - size, pos[2])
-            
-        # Bottom
-        if pattern[3]:
-            glVertex3f(pos[0] + size, pos[1] - size, pos[2])
-            glVertex3f(pos[0] - size, pos[1] - size, pos[2])
-            
-        # Bottom-left
-        if pattern[4]:
-            glVertex3f(pos[0] - size, pos[1] - size, pos[2])
-            glVertex3f(pos[0] - size, pos[1], pos[2])
-            
-        # Top-left
-        if pattern[5]:
-            glVertex3f(pos[0] - size, pos[1], pos[2])
-            glVertex3f(pos[0] - size, pos[1] + size, pos[2])
-            
-        # Middle
-        if pattern[6]:
-            glVertex3f(pos[0] - size, pos[1], pos[2])
-            glVertex3f(pos[0] + size, pos[1], pos[2])
-            
-        glEnd()
+        x, y, z = pos
+        
+        # Segment endpoints in the same order as the pattern
+        endpoints = [
+            ((x - size, y + size, z), (x + size, y + size, z)),  # Top
+            ((x + size, y + size, z), (x + size, y, z)),         # Top-right
+            ((x + size, y, z), (x + size, y - size, z)),         # Bottom-right
+            ((x + size, y - size, z), (x - size, y - size, z)),  # Bottom
+            ((x - size, y - size, z), (x - size, y, z)),         # Bottom-left
+            ((x - size, y, z), (x - size, y + size, z)),         # Top-left
+            ((x - size, y, z), (x + size, y, z)),                # Middle
+        ]
+        
+        lines = []
+        for enabled, (start, end) in zip(pattern, endpoints):
+            if enabled:
+                lines.extend([start, end])
+        batch.lines(lines, (1.0, 1.0, 0.0), 4.0, on_top=True, layer=2)
 
-    def draw_degree_symbol(self, pos):
+    def draw_degree_symbol(self, batch, pos):
         import math
-        glBegin(GL_LINE_LOOP)
         radius = 0.03  
+        loop = []
         for i in range(12):  
             angle = 2 * math.pi * i / 12
             x = pos[0] + radius * math.cos(angle)
             y = pos[1] + radius * math.sin(angle) + 0.05  
-            glVertex3f(x, y, pos[2])
-        glEnd()
+            loop.append((x, y, pos[2]))
+        batch.line_loop(loop, (1.0, 1.0, 0.0), 4.0, on_top=True, layer=2)
@@ -0,0 +1,48 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from graphics.obj_reader import read_obj_batches
+
+
+class MeshBatch:
+    def __init__(self, generation, vertices, faces):
+        self.generation = generation
+        self.vertices = vertices
+        self.faces = faces
+
+
+class ProgressiveMeshLoader(QObject):
+    # Emitted from the loader thread; Qt queues them onto the receiver's (GUI) thread
+    batch_ready = pyqtSignal(object)
+    load_finished = pyqtSignal(int)
+    load_failed = pyqtSignal(int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mesh-loader")
+        self._generation = 0
+
+    def load(self, filename):
+        # A new load supersedes the one in progress, which stops at its next batch
+        self._generation += 1
+        self._executor.submit(self._read, self._generation, filename)
+        return self._generation
+
+    def cancel(self):
+        self._generation += 1
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _read(self, generation, filename):
+        try:
+            for vertices, faces in read_obj_batches(filename):
+                if generation != self._generation:
+                    return
+                self.batch_ready.emit(MeshBatch(generation, vertices, faces))
+        except (OSError, ValueError) as e:
+            if generation == self._generation:
+                self.load_failed.emit(generation, str(e))
+            return
+        if generation == self._generation:
+            self.load_finished.emit(generation)
@@ -0,0 +1,134 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from math3d.quaternion import Quaternion
+import numpy as np
+import time
+
+
+class RotationResult:
+    def __init__(self, generation, mesh, axis, angle, vertices, requested_at, computed_at):
+        self.generation = generation
+        self.mesh = mesh
+        self.axis = axis
+        self.angle = angle
+        self.vertices = vertices
+        self.requested_at = requested_at
+        self.computed_at = computed_at
+
+
+class RotationPreviewWorker(QObject):
+    # Emitted from the worker thread; Qt queues it onto the receiver's (GUI) thread
+    result_ready = pyqtSignal(object)
+
+    CHUNK_SIZE = 65536
+
+    def __init__(self, debounce_ms=60, max_wait_ms=250, parent=None):
+        super().__init__(parent)
+        self.debounce_ms = debounce_ms
+        self.max_wait_ms = max_wait_ms
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rotation-preview")
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._submit)
+
+        self._generation = 0
+        self._pending = None
+        self._first_request_at = None
+        self._future = None
+
+        # Input change -> displayed frame, and input change -> rotated vertices ready, in milliseconds
+        self.latencies_ms = deque(maxlen=100)
+        self.compute_ms = None
+
+    @property
+    def latency_bound_ms(self):
+        return self.max_wait_ms
+
+    def request(self, mesh, axis, angle, immediate=False):
+        now = time.perf_counter()
+        if self._first_request_at is None:
+            self._first_request_at = now
+        self._pending = (mesh, list(axis), angle, now)
+        self.compute_ms = None
+
+        # Keep restarting the debounce timer while input changes, but never
+        # hold a request back longer than max_wait_ms so dragging stays live
+        waited_ms = (now - self._first_request_at) * 1000
+        remaining_ms = self.max_wait_ms - waited_ms
+        if immediate or remaining_ms <= 0:
+            self._timer.stop()
+            self._submit()
+        else:
+            self._timer.start(int(min(self.debounce_ms, remaining_ms)))
+
+    def cancel(self):
+        self._timer.stop()
+        self._pending = None
+        self._first_request_at = None
+        self.compute_ms = None
+        self._generation += 1
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    def is_current(self, result):
+        return result.generation == self._generation
+
+    def record_latency(self, latency_ms):
+        self.latencies_ms.append(latency_ms)
+
+    def record_result(self, result):
+        self.compute_ms = (result.computed_at - result.requested_at) * 1000
+
+    def latency_stats(self):
+        if not self.latencies_ms:
+            return None
+        samples = np.array(self.latencies_ms)
+        return {
+            'last': samples[-1],
+            'count': len(samples),
+            'mean': float(np.mean(samples)),
+            'max': float(np.max(samples)),
+            'compute': self.compute_ms,
+            # Over the same window as the other figures
+            'over_bound': int(np.count_nonzero(samples > self.latency_bound_ms)),
+        }
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _submit(self):
+        if self._pending is None:
+            return
+        mesh, axis, angle, requested_at = self._pending
+        self._pending = None
+        self._first_request_at = None
+
+        # A newer job supersedes whatever is queued or running
+        self._generation += 1
+        if self._future is not None:
+            self._future.cancel()
+        self._future = self._executor.submit(
+            self._compute, self._generation, mesh, axis, angle, requested_at
+        )
+
+    def _compute(self, generation, mesh, axis, angle, requested_at):
+        q = Quaternion.from_axis_angle(axis, angle)
+        vertices = np.asarray(mesh.vertices, dtype=np.float64)
+        rotated = np.empty_like(vertices)
+
+        # Rotate in chunks so a stale job notices it was superseded and bails out early
+        for start in range(0, len(vertices), self.CHUNK_SIZE):
+            if generation != self._generation:
+                return
+            end = start + self.CHUNK_SIZE
+            rotated[start:end] = q.rotate_vertices(vertices[start:end])
+
+        if generation != self._generation:
+            return
+        self.result_ready.emit(RotationResult(
+            generation, mesh, axis, angle, rotated, requested_at, time.perf_counter()
+        ))
@@ -6,4 +6,8 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    
+    # Live orientation samples piped in, e.g. from tools/orientation_producer.py
+    if "--orientation-stdin" in sys.argv:
+        window.start_stdin_stream()
     sys.exit(app.exec_())
@@ -0,0 +1,228 @@
+import numpy as np
+
+# Vectorized helpers for arrays of quaternions stored as (N, 4) rows in (w, x, y, z) order
+
+
+def as_quaternion_array(quaternions):
+    return np.asarray(quaternions, dtype=np.float64).reshape(-1, 4)
+
+
+def _row_norms(values):
+    return np.sqrt(np.einsum('ij,ij->i', values, values))
+
+
+def _cross(a, b):
+    # Column-wise cross product; np.cross is several times slower on (N, 3) arrays
+    result = np.empty(np.broadcast_shapes(a.shape, b.shape))
+    result[:, 0] = a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1]
+    result[:, 1] = a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2]
+    result[:, 2] = a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+    return result
+
+
+def normalize_quaternions(quaternions):
+    q = as_quaternion_array(quaternions)
+    norms = _row_norms(q)
+    valid = norms > 1e-12
+    result = q / np.where(valid, norms, 1.0)[:, None]
+
+    # Degenerate (zero) samples fall back to the identity rotation
+    if not valid.all():
+        result[~valid] = (1.0, 0.0, 0.0, 0.0)
+    return result
+
+
+def conjugate_quaternions(quaternions):
+    q = as_quaternion_array(quaternions).copy()
+    q[:, 1:] *= -1
+    return q
+
+
+def multiply_quaternions(a, b):
+    # Hamilton product row by row; either side may be a single quaternion and is broadcast
+    aw, ax, ay, az = np.moveaxis(np.asarray(a, dtype=np.float64), -1, 0)
+    bw, bx, by, bz = np.moveaxis(np.asarray(b, dtype=np.float64), -1, 0)
+    return np.stack([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ], axis=-1).reshape(-1, 4)
+
+
+def rotate_vectors(quaternions, vectors):
+    # v' = v + w * t + u x t with t = 2 * (u x v), for unit quaternions
+    q = normalize_quaternions(quaternions)
+    vectors = np.asarray(vectors, dtype=np.float64).reshape(-1, 3)
+    u = q[:, 1:]
+    t = 2.0 * _cross(u, vectors)
+    return vectors + q[:, :1] * t + _cross(u, t)
+
+
+def quaternions_to_matrices(quaternions):
+    w, x, y, z = normalize_quaternions(quaternions).T
+    matrices = np.empty((len(w), 3, 3))
+    matrices[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    matrices[:, 0, 1] = 2 * (x * y - w * z)
+    matrices[:, 0, 2] = 2 * (x * z + w * y)
+    matrices[:, 1, 0] = 2 * (x * y + w * z)
+    matrices[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    matrices[:, 1, 2] = 2 * (y * z - w * x)
+    matrices[:, 2, 0] = 2 * (x * z - w * y)
+    matrices[:, 2, 1] = 2 * (y * z + w * x)
+    matrices[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return matrices
+
+
+def axis_angle_to_quaternions(axes, angles_rad):
+    axes = np.asarray(axes, dtype=np.float64).reshape(-1, 3)
+    half_angles = 0.5 * np.asarray(angles_rad, dtype=np.float64).reshape(-1)
+    norms = np.linalg.norm(axes, axis=1, keepdims=True)
+    unit_axes = axes / np.maximum(norms, 1e-12)
+    return np.column_stack([np.cos(half_angles), unit_axes * np.sin(half_angles)[:, None]])
+
+
+def quaternions_to_axis_angle(quaternions):
+    q = normalize_quaternions(quaternions)
+    # Use the w >= 0 representative so angles fall in [0, pi]
+    q[q[:, 0] < 0] *= -1
+    vector_norms = _row_norms(q[:, 1:])
+    angles = 2.0 * np.arctan2(vector_norms, q[:, 0])
+
+    # The identity rotation has no defined axis; report X like Quaternion.to_axis_angle
+    axes = np.tile([1.0, 0.0, 0.0], (len(q), 1))
+    valid = vector_norms > 1e-12
+    axes[valid] = q[valid, 1:] / vector_norms[valid, None]
+    return axes, angles
+
+
+def matrices_to_quaternions(matrices):
+    # Shepperd's method: pick the largest of w, x, y, z as the pivot for numerical stability
+    m = np.asarray(matrices, dtype=np.float64).reshape(-1, 3, 3)
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+    pivots = np.argmax(np.column_stack([trace, m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]]), axis=1)
+    q = np.empty((len(m), 4))
+
+    rows = pivots == 0
+    s = 2.0 * np.sqrt(np.maximum(1.0 + trace[rows], 0.0))
+    q[rows] = np.column_stack([
+        0.25 * s,
+        (m[rows, 2, 1] - m[rows, 1, 2]) / s,
+        (m[rows, 0, 2] - m[rows, 2, 0]) / s,
+        (m[rows, 1, 0] - m[rows, 0, 1]) / s,
+    ])
+    for axis in range(3):
+        i, j, k = axis, (axis + 1) % 3, (axis + 2) % 3
+        rows = pivots == axis + 1
+        s = 2.0 * np.sqrt(np.maximum(1.0 + m[rows, i, i] - m[rows, j, j] - m[rows, k, k], 0.0))
+        block = np.empty((rows.sum(), 4))
+        block[:, 0] = (m[rows, k, j] - m[rows, j, k]) / s
+        block[:, 1 + i] = 0.25 * s
+        block[:, 1 + j] = (m[rows, j, i] + m[rows, i, j]) / s
+        block[:, 1 + k] = (m[rows, k, i] + m[rows, i, k]) / s
+        q[rows] = block
+    return normalize_quaternions(q)
+
+
+def rotation_vectors_to_quaternions(rotation_vectors):
+    rotation_vectors = np.asarray(rotation_vectors, dtype=np.float64).reshape(-1, 3)
+    angles = _row_norms(rotation_vectors)
+    # sin(angle / 2) / angle, written with np.sinc so it stays exact near zero
+    scale = 0.5 * np.sinc(angles / (2 * np.pi))
+    return np.column_stack([np.cos(angles / 2), rotation_vectors * scale[:, None]])
+
+
+def quaternions_to_rotation_vectors(quaternions):
+    axes, angles = quaternions_to_axis_angle(quaternions)
+    return axes * angles[:, None]
+
+
+EULER_AXES = {'x': 0, 'y': 1, 'z': 2}
+
+
+def _euler_axes(order):
+    order = order.lower()
+    if len(order) != 3 or set(order) != set('xyz'):
+        raise ValueError(f"Euler order must be a permutation of 'xyz', got '{order}'")
+    return [EULER_AXES[c] for c in order]
+
+
+def euler_to_quaternions(angles_rad, order='xyz'):
+    # Extrinsic rotations about the fixed world axes, applied in the given order
+    angles_rad = np.asarray(angles_rad, dtype=np.float64).reshape(-1, 3)
+    result = np.tile([1.0, 0.0, 0.0, 0.0], (len(angles_rad), 1))
+    for column, axis in enumerate(_euler_axes(order)):
+        half = 0.5 * angles_rad[:, column]
+        step = np.zeros((len(angles_rad), 4))
+        step[:, 0] = np.cos(half)
+        step[:, 1 + axis] = np.sin(half)
+        result = multiply_quaternions(step, result)
+    return result
+
+
+def quaternions_to_euler(quaternions, order='xyz'):
+    # Inverse of euler_to_quaternions; at gimbal lock the last angle is set to zero
+    i, j, k = _euler_axes(order)
+    parity = 1.0 if (j - i) % 3 == 1 else -1.0
+    m = quaternions_to_matrices(quaternions)
+
+    sin_middle = np.clip(-parity * m[:, k, i], -1.0, 1.0)
+    middle = np.arcsin(sin_middle)
+    first = np.arctan2(parity * m[:, k, j], m[:, k, k])
+    last = np.arctan2(parity * m[:, j, i], m[:, i, i])
+
+    locked = np.abs(sin_middle) > 1.0 - 1e-9
+    first[locked] = np.arctan2(-parity * m[locked, j, k], m[locked, j, j])
+    last[locked] = 0.0
+    return np.column_stack([first, middle, last])
+
+
+def geodesic_distance(a, b):
+    # Rotation angle of a^-1 b in [0, pi]. The chord form 4 * atan2(|a - b|, |a + b|) (with b
+    # flipped into a's hemisphere) keeps precision for nearly equal rotations, unlike acos(dot).
+    a = normalize_quaternions(a)
+    b = normalize_quaternions(b)
+    signs = np.where(np.einsum('ij,ij->i', *np.broadcast_arrays(a, b)) < 0, -1.0, 1.0)[:, None]
+    return 4.0 * np.arctan2(_row_norms(a - signs * b), _row_norms(a + signs * b))
+
+
+def average_quaternions(quaternions, weights=None, robust=False, iterations=10, scale_rad=None):
+    # Markley et al., "Averaging Quaternions" (2007): the mean is the dominant eigenvector
+    # of sum(w * q q^T), which is insensitive to the q / -q sign ambiguity.
+    q = normalize_quaternions(quaternions)
+    weights = np.ones(len(q)) if weights is None else np.asarray(weights, dtype=np.float64).reshape(-1)
+
+    def weighted_mean(w):
+        accumulator = (q * w[:, None]).T @ q
+        _, eigenvectors = np.linalg.eigh(accumulator)
+        mean = eigenvectors[:, -1]
+        return mean if mean[0] >= 0 else -mean
+
+    mean = weighted_mean(weights)
+    if not robust:
+        return mean
+
+    # Iteratively reweight with Geman-McClure weights on the geodesic residuals so outliers fade out
+    for _ in range(iterations):
+        residuals = geodesic_distance(mean, q)
+        scale = scale_rad if scale_rad is not None else max(1.4826 * np.median(residuals), 1e-6)
+        robust_weights = weights / (1.0 + (residuals / scale) ** 2) ** 2
+        new_mean = weighted_mean(robust_weights)
+        converged = geodesic_distance(mean, new_mean)[0] < 1e-10
+        mean = new_mean
+        if converged:
+            break
+    return mean
+
+
+def random_quaternions(count, rng=None):
+    # Uniformly distributed rotations (Shoemake, "Uniform random rotations", 1992)
+    rng = np.random.default_rng() if rng is None else rng
+    u1, u2, u3 = rng.random((3, count))
+    a, b = np.sqrt(1 - u1), np.sqrt(u1)
+    return np.column_stack([
+        b * np.cos(2 * np.pi * u3),
+        a * np.sin(2 * np.pi * u2),
+        a * np.cos(2 * np.pi * u2),
+        b * np.sin(2 * np.pi * u3),
+    ])
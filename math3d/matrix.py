@@ -0,0 +1,41 @@
+import math
+import numpy as np
+
+# Row-major 4x4 transforms matching the fixed-function helpers (gluPerspective, glTranslatef, ...)
+
+
+def perspective(fovy_deg, aspect, near, far):
+    f = 1.0 / math.tan(math.radians(fovy_deg) / 2)
+    matrix = np.zeros((4, 4))
+    matrix[0, 0] = f / aspect
+    matrix[1, 1] = f
+    matrix[2, 2] = (far + near) / (near - far)
+    matrix[2, 3] = 2 * far * near / (near - far)
+    matrix[3, 2] = -1.0
+    return matrix
+
+
+def translation(x, y, z):
+    matrix = np.identity(4)
+    matrix[:3, 3] = (x, y, z)
+    return matrix
+
+
+def rotation(angle_deg, x, y, z):
+    axis = np.array([x, y, z], dtype=np.float64)
+    axis /= np.linalg.norm(axis)
+    c, s = math.cos(math.radians(angle_deg)), math.sin(math.radians(angle_deg))
+    cross = np.array([
+        [0, -axis[2], axis[1]],
+        [axis[2], 0, -axis[0]],
+        [-axis[1], axis[0], 0],
+    ])
+    matrix = np.identity(4)
+    matrix[:3, :3] = c * np.identity(3) + s * cross + (1 - c) * np.outer(axis, axis)
+    return matrix
+
+
+def scaling(s):
+    matrix = np.identity(4)
+    matrix[0, 0] = matrix[1, 1] = matrix[2, 2] = s
+    return matrix
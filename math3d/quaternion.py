@@ -1,4 +1,6 @@
 from math3d.vector3d import Vector3D
+import math
+import numpy as np
 
 class Quaternion:
     def __init__(self, w=1.0, vector: Vector3D = None):
@@ -7,6 +9,12 @@ class Quaternion:
             self.vector = vector
         else:
             self.vector = Vector3D(0.0, 0.0, 0.0)
+
+    @staticmethod
+    def from_axis_angle(axis, angle_deg):
+        axis_vec = Vector3D(*axis).normalize()
+        half_angle = math.radians(angle_deg) / 2
+        return Quaternion(math.cos(half_angle), axis_vec.mult(math.sin(half_angle)))
     
     @property
     def x(self):
@@ -71,8 +79,25 @@ class Quaternion:
         conjugated_vector = Vector3D(-self.x, -self.y, -self.z)
         return Quaternion(self.w, conjugated_vector)
 
+    def to_axis_angle(self):
+        # Assumes a unit quaternion; the identity rotation reports the X axis
+        w = max(-1.0, min(1.0, self.w))
+        angle_deg = math.degrees(2 * math.acos(w))
+        s = math.sqrt(1.0 - w * w)
+        if s < 1e-8:
+            return [1.0, 0.0, 0.0], 0.0
+        return [self.x / s, self.y / s, self.z / s], angle_deg
+
     def rotate(self, vector: Vector3D):
         q_vector = Quaternion(0, vector)
         rotated_vector = self * q_vector * self.conjugate()
         result = Vector3D(rotated_vector.x, rotated_vector.y, rotated_vector.z)
-        return result
\ No newline at end of file
+        return result
+
+    def rotate_vertices(self, vertices):
+        # Vectorized q * v * q^-1 for an (N, 3) array, assuming a unit quaternion:
+        # v' = v + w * t + u x t with t = 2 * (u x v)
+        vertices = np.asarray(vertices, dtype=np.float64)
+        u = np.array([self.x, self.y, self.z], dtype=np.float64)
+        t = 2.0 * np.cross(u, vertices)
+        return vertices + self.w * t + np.cross(u, t)
@@ -0,0 +1,96 @@
+from math3d.batch import normalize_quaternions
+import numpy as np
+import hashlib
+import os
+import tempfile
+
+# Orientation logs are sequences of (t, w, x, y, z) samples with timestamps in
+# seconds, sorted ascending. Binary logs are raw little-endian float64 records
+# of those five values; CSV logs are converted once to that layout so both can
+# be memory-mapped and seeked without loading the whole file.
+
+RECORD_FIELDS = 5
+RECORD_DTYPE = np.dtype('<f8')
+CSV_EXTENSIONS = ('.csv', '.txt')
+CSV_CHUNK_ROWS = 200000
+
+
+def binary_cache_path(csv_filename):
+    stat = os.stat(csv_filename)
+    key = f"{os.path.abspath(csv_filename)}:{stat.st_mtime_ns}:{stat.st_size}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    cache_dir = os.path.join(tempfile.gettempdir(), "quaternion-visualizer")
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, f"{digest}.qlog")
+
+
+def convert_csv_to_binary(csv_filename, binary_filename, chunk_rows=CSV_CHUNK_ROWS):
+    partial_filename = binary_filename + ".partial"
+
+    def write_chunk(lines, dst):
+        samples = np.loadtxt(lines, delimiter=',', ndmin=2, dtype=np.float64)
+        if samples.shape[1] != RECORD_FIELDS:
+            raise ValueError(f"Expected {RECORD_FIELDS} columns (t, w, x, y, z), got {samples.shape[1]}")
+        dst.write(samples.astype(RECORD_DTYPE, copy=False).tobytes())
+
+    # Stream the CSV in fixed-size chunks so memory stays flat for huge logs
+    with open(csv_filename, 'r') as src, open(partial_filename, 'wb') as dst:
+        lines = []
+        for line in src:
+            stripped = line.strip()
+            if not stripped or stripped.startswith('#') or stripped[0].isalpha():
+                continue  # Blank lines, comments and header rows
+            lines.append(stripped)
+            if len(lines) >= chunk_rows:
+                write_chunk(lines, dst)
+                lines = []
+        if lines:
+            write_chunk(lines, dst)
+
+    os.replace(partial_filename, binary_filename)
+
+
+class OrientationLog:
+    def __init__(self, filename):
+        self.filename = filename
+
+        if filename.lower().endswith(CSV_EXTENSIONS):
+            binary_filename = binary_cache_path(filename)
+            if not os.path.exists(binary_filename):
+                convert_csv_to_binary(filename, binary_filename)
+        else:
+            binary_filename = filename
+
+        size = os.path.getsize(binary_filename)
+        record_bytes = RECORD_FIELDS * RECORD_DTYPE.itemsize
+        if size == 0 or size % record_bytes != 0:
+            raise ValueError(f"{filename} is not a valid orientation log ({size} bytes)")
+
+        self.data = np.memmap(binary_filename, dtype=RECORD_DTYPE, mode='r').reshape(-1, RECORD_FIELDS)
+        self.timestamps = self.data[:, 0]
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def start_time(self):
+        return float(self.timestamps[0])
+
+    @property
+    def end_time(self):
+        return float(self.timestamps[-1])
+
+    @property
+    def duration(self):
+        return self.end_time - self.start_time
+
+    def resample(self, times):
+        # Nearest preceding sample for each display time; only the touched pages are read
+        times = np.asarray(times, dtype=np.float64)
+        indices = np.searchsorted(self.timestamps, times, side='right') - 1
+        np.clip(indices, 0, len(self.data) - 1, out=indices)
+
+        frames = np.empty((len(times), RECORD_FIELDS))
+        frames[:, 0] = times
+        frames[:, 1:] = normalize_quaternions(self.data[indices, 1:])
+        return frames
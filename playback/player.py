@@ -0,0 +1,134 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from playback.orientation_log import OrientationLog
+from playback.ring_buffer import OrientationRingBuffer
+from playback.stream_source import SocketStreamReader, StdinStreamReader
+import numpy as np
+import time
+
+
+class OrientationPlayer(QObject):
+    # Seconds from the start of the log (or received sample count for live streams)
+    position_changed = pyqtSignal(float)
+    playing_changed = pyqtSignal(bool)
+
+    LOOKAHEAD_SECONDS = 0.5
+
+    def __init__(self, gl_widget, display_rate_hz=60, parent=None):
+        super().__init__(parent)
+        self.gl_widget = gl_widget
+        self.display_rate_hz = display_rate_hz
+        self.ring = OrientationRingBuffer()
+
+        self.log = None
+        self.stream = None
+        self.speed = 1.0
+        self.position = 0.0
+        self._filled_until = None
+        self._last_tick = None
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(1000 / display_rate_hz))
+        self.timer.timeout.connect(self._tick)
+
+    @property
+    def duration(self):
+        return self.log.duration if self.log is not None else 0.0
+
+    @property
+    def is_playing(self):
+        return self.timer.isActive()
+
+    def open_log(self, filename):
+        self.stop()
+        self.log = OrientationLog(filename)
+        self.seek(0.0)
+        return self.log
+
+    def listen(self, port):
+        self.stop()
+        self.stream = SocketStreamReader(self.ring, port)
+        self.stream.start()
+        self.play()
+
+    def read_stdin(self):
+        self.stop()
+        self.stream = StdinStreamReader(self.ring)
+        self.stream.start()
+        self.play()
+
+    def play(self):
+        if self.log is None and self.stream is None:
+            return
+        if self.log is not None and self.position >= self.duration:
+            self.seek(0.0)
+        self._last_tick = time.perf_counter()
+        self.timer.start()
+        self.playing_changed.emit(True)
+
+    def pause(self):
+        self.timer.stop()
+        self.playing_changed.emit(False)
+
+    def stop(self):
+        self.pause()
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream = None
+        self.log = None
+        self.ring.clear()
+        self.position = 0.0
+        self.gl_widget.clear_playback_orientation()
+
+    def set_speed(self, speed):
+        self.speed = max(speed, 1e-3)
+        self._reset_buffer()
+
+    def seek(self, seconds):
+        if self.log is None:
+            return
+        self.position = min(max(seconds, 0.0), self.duration)
+        self._reset_buffer()
+        self._show_frame(self.log.resample([self.log.start_time + self.position])[0])
+
+    def _reset_buffer(self):
+        # Pre-resampled frames depend on position and speed, so drop them
+        self.ring.clear()
+        self._filled_until = None
+
+    def _frame_step(self):
+        # Log time covered by one displayed frame: the display-rate downsampling interval
+        return self.speed / self.display_rate_hz
+
+    def _fill_until(self, log_time):
+        step = self._frame_step()
+        start = self._filled_until + step if self._filled_until is not None else log_time - step
+        end = min(log_time + self.LOOKAHEAD_SECONDS * self.speed, self.log.end_time)
+        if start > end:
+            return
+        times = np.arange(start, end + step * 0.5, step)
+        times = times[-self.ring.capacity:]
+        self.ring.push(self.log.resample(times))
+        self._filled_until = times[-1]
+
+    def _tick(self):
+        now = time.perf_counter()
+        elapsed = now - self._last_tick
+        self._last_tick = now
+
+        if self.log is not None:
+            self.position = min(self.position + elapsed * self.speed, self.duration)
+            log_time = self.log.start_time + self.position
+            self._fill_until(log_time)
+            frame = self.ring.pop_until(log_time)
+            self.position_changed.emit(self.position)
+            if self.position >= self.duration:
+                self.pause()
+        else:
+            frame = self.ring.pop_latest()
+            self.position_changed.emit(float(self.stream.received))
+
+        if frame is not None:
+            self._show_frame(frame)
+
+    def _show_frame(self, frame):
+        self.gl_widget.set_playback_orientation(frame[1:])
@@ -0,0 +1,60 @@
+import numpy as np
+import threading
+
+
+class OrientationRingBuffer:
+    def __init__(self, capacity=4096, fields=5):
+        self.capacity = capacity
+        self._data = np.zeros((capacity, fields))
+        self._start = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, samples):
+        samples = np.asarray(samples, dtype=np.float64).reshape(-1, self._data.shape[1])
+        with self._lock:
+            # Writers never block: when full, the oldest samples are overwritten
+            if len(samples) > self.capacity:
+                self.dropped += len(samples) - self.capacity
+                samples = samples[-self.capacity:]
+
+            positions = (self._start + self._size + np.arange(len(samples))) % self.capacity
+            self._data[positions] = samples
+            self._size += len(samples)
+
+            if self._size > self.capacity:
+                overflow = self._size - self.capacity
+                self._start = (self._start + overflow) % self.capacity
+                self._size = self.capacity
+                self.dropped += overflow
+
+    def pop_until(self, timestamp):
+        with self._lock:
+            if self._size == 0:
+                return None
+            positions = (self._start + np.arange(self._size)) % self.capacity
+            count = int(np.searchsorted(self._data[positions, 0], timestamp, side='right'))
+            if count == 0:
+                return None
+            latest = self._data[positions[count - 1]].copy()
+            self._start = (self._start + count) % self.capacity
+            self._size -= count
+            return latest
+
+    def pop_latest(self):
+        with self._lock:
+            if self._size == 0:
+                return None
+            latest = self._data[(self._start + self._size - 1) % self.capacity].copy()
+            self._start = 0
+            self._size = 0
+            return latest
+
+    def clear(self):
+        with self._lock:
+            self._start = 0
+            self._size = 0
@@ -0,0 +1,121 @@
+from math3d.batch import normalize_quaternions
+import numpy as np
+import socket
+import sys
+import threading
+import time
+
+
+def parse_samples(lines):
+    # Accepts "t,w,x,y,z" lines, or "w,x,y,z" lines stamped with the arrival time
+    rows = []
+    for line in lines:
+        try:
+            values = [float(v) for v in line.split(b',')]
+        except ValueError:
+            continue
+        if len(values) == 4:
+            values.insert(0, time.perf_counter())
+        if len(values) == 5:
+            rows.append(values)
+    if not rows:
+        return None
+    samples = np.array(rows, dtype=np.float64)
+    samples[:, 1:] = normalize_quaternions(samples[:, 1:])
+    return samples
+
+
+class StreamReader(threading.Thread):
+    CHUNK_BYTES = 65536
+
+    def __init__(self, ring, description):
+        super().__init__(daemon=True, name=f"orientation-stream-{description}")
+        self.ring = ring
+        self.description = description
+        self.received = 0
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        remainder = b""
+        while not self._stopped.is_set():
+            chunk = self.read_chunk()
+            if not chunk:
+                if chunk is None:
+                    continue  # Timed out waiting for data
+                break
+            lines = (remainder + chunk).split(b'\n')
+            remainder = lines.pop()
+            samples = parse_samples(lines)
+            if samples is not None:
+                self.ring.push(samples)
+                self.received += len(samples)
+        self.close()
+
+    def read_chunk(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SocketStreamReader(StreamReader):
+    def __init__(self, ring, port, host='127.0.0.1'):
+        super().__init__(ring, f"tcp:{port}")
+        self.server = socket.create_server((host, port))
+        self.server.settimeout(0.2)
+        self.connection = None
+
+    def stop(self):
+        # Release the port right away instead of at the reader's next timeout, so it can be bound
+        # again at once. close() alone doesn't wake a thread polling the socket, shutdown() does.
+        super().stop()
+        for sock in (self.connection, self.server):
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass  # Not connected, or already closed by the reader
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+        self.close()
+
+    def read_chunk(self):
+        # Wait for a producer to connect, then read until it disconnects
+        try:
+            if self.connection is None:
+                try:
+                    self.connection, _ = self.server.accept()
+                    self.connection.settimeout(0.2)
+                except socket.timeout:
+                    return None
+            try:
+                chunk = self.connection.recv(self.CHUNK_BYTES)
+            except socket.timeout:
+                return None
+        except OSError:
+            # stop() closed the sockets under a blocked accept/recv
+            if self._stopped.is_set():
+                return b""
+            raise
+        if not chunk:
+            self.connection.close()
+            self.connection = None
+            return None  # Keep listening for the next producer
+        return chunk
+
+    def close(self):
+        connection = self.connection
+        if connection is not None:
+            connection.close()
+        self.server.close()
+
+
+class StdinStreamReader(StreamReader):
+    def __init__(self, ring):
+        super().__init__(ring, "stdin")
+
+    def read_chunk(self):
+        return sys.stdin.buffer.read1(self.CHUNK_BYTES)
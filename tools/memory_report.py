@@ -0,0 +1,78 @@
+import argparse
+import os
+import sys
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from graphics.mesh_object import MeshObject
+from graphics.memory_stats import AllocationTracer, footprint_table, format_bytes, unique_nbytes
+from graphics.point_cloud import DEFAULT_POINT_BUDGET
+from graphics.rotation_cache import RotationCache
+from math3d.batch import random_quaternions
+from math3d.quaternion import Quaternion
+from math3d.vector3d import Vector3D
+
+
+def profile_model(filename, tracer, optimize=False, rotations=1, point_budget=DEFAULT_POINT_BUDGET):
+    # Goes through what the viewer does with a model, without a GL context: load, build the
+    # draw buffer, rotate (through the rotation cache) and sample a point cloud. GPU sizes
+    # are what the buffers take once uploaded by the shader renderer.
+    with tracer.trace("load"):
+        mesh = MeshObject(filename, optimize=optimize)
+    with tracer.trace("draw buffer"):
+        # Built and handed to the GPU on upload; nothing of it stays on the host
+        mesh.draw_buffer()
+
+    cache = RotationCache()
+    rotated = None
+    with tracer.trace("rotate"):
+        for w, x, y, z in random_quaternions(rotations, np.random.default_rng(0)):
+            q = Quaternion(w, Vector3D(x, y, z))
+            vertices = q.rotate_vertices(mesh.vertices)
+            cache.put(mesh, q, vertices)
+            rotated = mesh.create_copy_with_new_vertices(vertices)
+
+    cloud = None
+    if point_budget:
+        with tracer.trace("point cloud"):
+            cloud = mesh.point_cloud(point_budget)
+
+    rows = []
+    for label, buffer in (("Original", mesh), ("Rotated", rotated), ("Point cloud", cloud)):
+        if buffer is not None:
+            footprint = buffer.footprint()
+            footprint['gpu'] = buffer.upload_nbytes(indexed=True)
+            rows.append((label, footprint))
+    rows.append(("Rotation cache", {'vertices': cache.used_bytes}))
+
+    buffers = [buffer for buffer in (mesh, rotated, cloud) if buffer is not None]
+    arrays = cache.arrays() + [array for buffer in buffers for group in buffer.host_arrays().values() for array in group]
+    return rows, unique_nbytes(arrays), sum(footprint.get('gpu', 0) for _, footprint in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory footprint and peak allocations of loading and rotating models")
+    parser.add_argument("models", nargs="*", default=[os.path.join(ROOT, "obj", "Car.obj")])
+    parser.add_argument("--optimize", action="store_true", help="load through the vertex-cache optimizer")
+    parser.add_argument("--rotations", type=int, default=1, help="distinct rotations kept in the rotation cache")
+    parser.add_argument("--points", type=int, default=DEFAULT_POINT_BUDGET, metavar="BUDGET",
+                        help="point-cloud budget, 0 to skip the point cloud")
+    args = parser.parse_args()
+
+    for filename in args.models:
+        tracer = AllocationTracer(enabled=True)
+        rows, host_bytes, gpu_bytes = profile_model(
+            filename, tracer, optimize=args.optimize, rotations=max(args.rotations, 1), point_budget=args.points
+        )
+        print(f"== {filename}")
+        print(footprint_table(rows))
+        print(f"Total: {format_bytes(host_bytes)} RAM (shared arrays counted once), {format_bytes(gpu_bytes)} GPU")
+        print("Peak allocations (tracemalloc):")
+        print(tracer.report())
+        print()
+
+
+if __name__ == "__main__":
+    main()
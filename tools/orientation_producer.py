@@ -0,0 +1,74 @@
+import argparse
+import os
+import socket
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from math3d.batch import normalize_quaternions
+
+
+def generate_samples(times):
+    # A tumbling orientation: the rotation axis precesses while the angle keeps growing
+    axis = np.column_stack([np.cos(0.3 * times), np.sin(0.3 * times), np.full_like(times, 0.5)])
+    axis /= np.linalg.norm(axis, axis=1, keepdims=True)
+    half_angle = 0.5 * (1.2 * times)
+    quaternions = np.column_stack([np.cos(half_angle), axis * np.sin(half_angle)[:, None]])
+    return np.column_stack([times, normalize_quaternions(quaternions)])
+
+
+def write_log(filename, count, rate_hz, chunk=1000000):
+    binary = not filename.lower().endswith(('.csv', '.txt'))
+    with open(filename, 'wb') as f:
+        if not binary:
+            f.write(b"t,w,x,y,z\n")
+        for start in range(0, count, chunk):
+            times = np.arange(start, min(start + chunk, count)) / rate_hz
+            samples = generate_samples(times)
+            if binary:
+                f.write(samples.astype('<f8').tobytes())
+            else:
+                np.savetxt(f, samples, delimiter=',', fmt='%.9f')
+    print(f"Wrote {count:,} samples to {filename}")
+
+
+def stream(output, rate_hz, duration):
+    start = time.perf_counter()
+    sent = 0
+    while duration is None or time.perf_counter() - start < duration:
+        elapsed = time.perf_counter() - start
+        due = int(elapsed * rate_hz) + 1
+        if due > sent:
+            times = np.arange(sent, due) / rate_hz
+            lines = "".join(f"{t:.6f},{w:.9f},{x:.9f},{y:.9f},{z:.9f}\n" for t, w, x, y, z in generate_samples(times))
+            output(lines.encode())
+            sent = due
+        time.sleep(1.0 / rate_hz)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate orientation logs or live orientation streams")
+    parser.add_argument("--write-log", metavar="FILE", help="write a .csv or binary log instead of streaming")
+    parser.add_argument("--samples", type=int, default=1000000, help="number of samples for --write-log")
+    parser.add_argument("--port", type=int, help="stream to a visualizer listening on this local port")
+    parser.add_argument("--rate", type=float, default=200.0, help="sample rate in Hz")
+    parser.add_argument("--duration", type=float, help="stop streaming after this many seconds")
+    args = parser.parse_args()
+
+    if args.write_log:
+        write_log(args.write_log, args.samples, args.rate)
+    elif args.port:
+        with socket.create_connection(("127.0.0.1", args.port)) as connection:
+            stream(connection.sendall, args.rate, args.duration)
+    else:
+        # Pipe into the visualizer: python tools/orientation_producer.py | python main.py --orientation-stdin
+        def write_stdout(data):
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+        stream(write_stdout, args.rate, args.duration)
+
+
+if __name__ == "__main__":
+    main()
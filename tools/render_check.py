@@ -0,0 +1,117 @@
+import argparse
+import ctypes
+import os
+import sys
+
+# Headless render through Mesa's software rasterizer (llvmpipe) via EGL, no display needed.
+# Must be set before PyOpenGL and Qt are imported.
+os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
+os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('LIBGL_ALWAYS_SOFTWARE', '1')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from OpenGL import EGL
+from OpenGL.GL import glFinish, glGetError, glGetString, glReadPixels, GL_RENDERER, GL_VERSION, GL_RGB, GL_UNSIGNED_BYTE, GL_NO_ERROR
+
+EGL_CONTEXT_MAJOR_VERSION = 0x3098
+EGL_CONTEXT_MINOR_VERSION = 0x30FB
+EGL_CONTEXT_OPENGL_PROFILE_MASK = 0x30FD
+EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT = 0x1
+
+
+def make_current_context(width, height, core_profile):
+    display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    if not EGL.eglInitialize(display, None, None):
+        raise RuntimeError("eglInitialize failed")
+
+    config_attributes = (EGL.EGLint * 13)(
+        EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+        EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+        EGL.EGL_DEPTH_SIZE, 24,
+        EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+        EGL.EGL_NONE,
+    )
+    config = EGL.EGLConfig()
+    count = EGL.EGLint()
+    EGL.eglChooseConfig(display, config_attributes, ctypes.pointer(config), 1, ctypes.pointer(count))
+    if count.value == 0:
+        raise RuntimeError("No EGL config with OpenGL support")
+
+    surface = EGL.eglCreatePbufferSurface(
+        display, config, (EGL.EGLint * 5)(EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE)
+    )
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+    context_attributes = None
+    if core_profile:
+        context_attributes = (EGL.EGLint * 7)(
+            EGL_CONTEXT_MAJOR_VERSION, 3, EGL_CONTEXT_MINOR_VERSION, 3,
+            EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+            EGL.EGL_NONE,
+        )
+    context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, context_attributes)
+    EGL.eglMakeCurrent(display, surface, surface, context)
+
+
+def read_frame(width, height):
+    pixels = glReadPixels(0, 0, width, height, GL_RGB, GL_UNSIGNED_BYTE)
+    return np.frombuffer(pixels, np.uint8).reshape(height, width, 3)[::-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render one frame headlessly with a software OpenGL implementation")
+    parser.add_argument("model", nargs="?", default=os.path.join(ROOT, "obj", "Car.obj"))
+    parser.add_argument("--renderer", choices=["shader", "fixed"], default="shader")
+    parser.add_argument("--core", action="store_true", help="use a 3.3 core-profile context (shader renderer only)")
+    parser.add_argument("--optimize", action="store_true", help="load through the mesh optimizer (drawn indexed by the shader renderer)")
+    parser.add_argument("--points", type=int, metavar="BUDGET", help="render in point-cloud mode with this point budget")
+    parser.add_argument("--size", type=int, nargs=2, default=(640, 480), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--output", help="save the frame as an image (requires Pillow)")
+    args = parser.parse_args()
+
+    os.environ["QUATERNION_VISUALIZER_RENDERER"] = args.renderer
+    width, height = args.size
+
+    from PyQt5.QtWidgets import QApplication
+    from gui.opengl_widget import GLWidget
+
+    app = QApplication(sys.argv)
+    widget = GLWidget()
+    widget.resize(width, height)
+
+    # Drive the widget's GL callbacks directly against our own context
+    make_current_context(width, height, args.core)
+    print(f"OpenGL: {glGetString(GL_VERSION).decode()} on {glGetString(GL_RENDERER).decode()}")
+    widget.initializeGL()
+    widget.resizeGL(width, height)
+    if args.renderer == "fixed" and widget.renderer.name != "fixed-function":
+        raise SystemExit("Fixed-function renderer requested but not active")
+
+    widget.load_mesh(args.model, optimize=args.optimize)
+    if args.points:
+        widget.set_point_cloud_mode(True, budget=args.points)
+    widget.rotate_mesh([0.0, 1.0, 0.0], 60.0)
+    widget.camera_rotation_x = 20.0
+    widget.camera_rotation_y = 30.0
+    widget.paintGL()
+    glFinish()
+
+    error = glGetError()
+    frame = read_frame(width, height)
+    covered = int((np.abs(frame.astype(int) - 25).sum(axis=2) > 30).sum())
+    print(f"Renderer: {widget.renderer.name}, covered pixels: {covered:,}, GL error: {error}")
+
+    if args.output:
+        from PIL import Image
+        Image.fromarray(frame).save(args.output)
+        print(f"Saved {args.output}")
+
+    if error != GL_NO_ERROR or covered == 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()